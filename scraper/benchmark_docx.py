@@ -0,0 +1,76 @@
+"""
+Benchmark resume DOCX extraction: the original python-docx object model
+versus the streaming XML parser used by /extract/resume
+Each run happens in a fresh process so peak memory can be compared. Peak is
+the growth of the process's peak RSS (Linux VmHWM, reset before parsing).
+
+Usage: python benchmark_docx.py [sections ...]   (20 bullets and a table per section)
+"""
+
+import io
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from make_docx import make_docx
+
+
+def legacy_extract(content):
+    """The pre-streaming implementation: full Document, body paragraphs only"""
+    from docx import Document
+    doc = Document(io.BytesIO(content))
+    return '\n'.join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+def streaming_extract(content):
+    from resume_parser import parse_docx
+    return parse_docx(content, time.time() + 600, 10 ** 9)['text']
+
+
+def peak_rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 1024 / 1024
+
+
+def measure(name, content):
+    """(seconds, peak RSS growth in MB, chars) for one parser in this process"""
+    func = legacy_extract if name == 'legacy' else streaming_extract
+    # Import outside the measured region
+    func(make_docx(1, 1))
+    # Forget the peak inherited from startup (and from the parent that spawned us)
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    text = func(content)
+    seconds = time.perf_counter() - start
+    return seconds, peak_rss_mb() - baseline, len(text)
+
+
+def in_fresh_process(name, content):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(measure, name, content).result()
+
+
+def main(section_counts):
+    print(f"{'sections':>8} {'paragraphs':>10} {'size KB':>8} {'legacy (s)':>11} {'stream (s)':>11} "
+          f"{'speedup':>8} {'legacy MB':>10} {'stream MB':>10} {'legacy chars':>13} {'stream chars':>13}")
+    for sections in section_counts:
+        content = make_docx(sections)
+        legacy_seconds, legacy_mb, legacy_chars = in_fresh_process('legacy', content)
+        stream_seconds, stream_mb, stream_chars = in_fresh_process('stream', content)
+        print(f"{sections:>8} {sections * 25:>10} {len(content) / 1024:>8.0f} {legacy_seconds:>11.3f} {stream_seconds:>11.3f} "
+              f"{legacy_seconds / stream_seconds:>7.2f}x {legacy_mb:>10.1f} {stream_mb:>10.1f} {legacy_chars:>13} {stream_chars:>13}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 5000])
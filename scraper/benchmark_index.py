@@ -0,0 +1,99 @@
+"""
+Benchmark the memory-mapped vector index at several corpus sizes
+For each size: append time, exact top-k latency (one matrix-vector product
+plus argpartition), per-user top-k latency, IVF build time, and IVF latency
+with recall@k against the exact results. At the smallest size a per-row
+Python cosine loop (what the backend does today) is timed for comparison.
+Vectors are clustered synthetic embeddings, so IVF recall is meaningful.
+
+Usage: python benchmark_index.py [size ...]   (default: 10000 100000 1000000)
+"""
+
+import math
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from vector_index import VectorIndex
+
+DIM = 384
+K = 10
+QUERIES = 50
+USERS = 1000
+CLUSTERS = 2000
+# Per-dimension noise around a cluster center (noise norm about 0.6 vs unit centers)
+NOISE = 0.6 / math.sqrt(DIM)
+
+
+def synthetic_vectors(rng, centers, count):
+    labels = rng.integers(0, len(centers), size=count)
+    return (centers[labels] + NOISE * rng.standard_normal((count, DIM), dtype=np.float32)).astype(np.float32)
+
+
+def loop_top_k(rows, query, k):
+    """Cosine per row in Python, then sort: the backend's LINQ approach"""
+    def cosine(a, b):
+        dot = na = nb = 0.0
+        for x, y in zip(a, b):
+            dot += x * y
+            na += x * x
+            nb += y * y
+        return dot / (math.sqrt(na) * math.sqrt(nb))
+    return sorted(((cosine(query, row), i) for i, row in enumerate(rows)), reverse=True)[:k]
+
+
+def timed_queries(run, queries):
+    start = time.perf_counter()
+    results = [run(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def bench(size, rng, centers):
+    directory = tempfile.mkdtemp(prefix='vector-index-bench-')
+    try:
+        index = VectorIndex(directory, dim=DIM)
+        start = time.perf_counter()
+        # One add per user, as when each user's documents are indexed
+        per_user = math.ceil(size / USERS)
+        for first in range(0, size, per_user):
+            count = min(per_user, size - first)
+            index.add([f"c{first + i}" for i in range(count)], synthetic_vectors(rng, centers, count), user_id=f"u{first // per_user}")
+        add_seconds = time.perf_counter() - start
+
+        queries = synthetic_vectors(rng, centers, QUERIES)
+        exact_ms, exact = timed_queries(lambda q: index.search(q, K), queries)
+        user_ms, _ = timed_queries(lambda q: index.search(q, K, user_id="u0"), queries)
+
+        start = time.perf_counter()
+        lists = index.build_ivf()
+        ivf_seconds = time.perf_counter() - start
+        ivf_ms, approx = timed_queries(lambda q: index.search(q, K, approximate=True), queries)
+        recall = np.mean([
+            len({r['id'] for r in a} & {r['id'] for r in e}) / max(len(e), 1)
+            for a, e in zip(approx, exact)
+        ])
+
+        print(f"{size:>9,} rows | add {add_seconds:6.2f} s | exact {exact_ms:7.2f} ms | user {user_ms:6.2f} ms | "
+              f"IVF build {ivf_seconds:6.1f} s ({lists} lists) | IVF {ivf_ms:6.2f} ms, recall@{K} {recall:.3f}")
+
+        if size <= 10000:
+            rows = np.asarray(index._vectors.data[:size]).tolist()
+            loop_ms, _ = timed_queries(lambda q: loop_top_k(rows, q.tolist(), K), queries[:5])
+            print(f"{'':>9} Python cosine loop: {loop_ms:8.1f} ms per query ({loop_ms / exact_ms:.0f}x slower than exact)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(sizes):
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((CLUSTERS, DIM), dtype=np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    for size in sizes:
+        bench(size, rng, centers)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
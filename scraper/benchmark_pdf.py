@@ -0,0 +1,76 @@
+"""
+Benchmark resume PDF extraction: the original sequential loop versus the
+page-parallel process pool used by /extract/resume
+
+Usage: python benchmark_pdf.py [pages ...]
+Set RESUME_PARSE_WORKERS to compare pool sizes.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+
+# Read every page of the larger documents
+os.environ.setdefault('RESUME_MAX_PAGES', '1000')
+os.environ.setdefault('RESUME_MAX_CHARS', '100000000')
+os.environ.setdefault('RESUME_PARSE_TIMEOUT', '600')
+
+import parse_pool
+from make_pdf import make_pdf
+
+
+def legacy_extract(content):
+    """The pre-pool implementation: one reader, repeated string concatenation"""
+    from pypdf import PdfReader
+    reader = PdfReader(io.BytesIO(content))
+    text = ""
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + '\n'
+    return text
+
+
+def best_of(func, repeats):
+    best = float('inf')
+    value = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+async def bench_pool(content, repeats):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = await parse_pool.extract_document('pdf', content)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+async def main():
+    page_counts = [int(p) for p in sys.argv[1:]] or [1, 10, 50, 100, 200]
+
+    # Start the workers outside the timed runs
+    await parse_pool.extract_document('pdf', make_pdf(1))
+
+    print(f"{parse_pool.PARSE_WORKERS} worker(s), {parse_pool.PAGES_PER_TASK} pages per task minimum\n")
+    print(f"{'pages':>6} {'size KB':>8} {'legacy (s)':>11} {'pool (s)':>9} {'speedup':>8} {'same text':>10}")
+    for pages in page_counts:
+        content = make_pdf(pages)
+        repeats = 3 if pages <= 50 else 1
+        legacy_seconds, legacy_text = best_of(lambda: legacy_extract(content), repeats)
+        pool_seconds, result = await bench_pool(content, repeats)
+        print(f"{pages:>6} {len(content) / 1024:>8.0f} {legacy_seconds:>11.3f} {pool_seconds:>9.3f} "
+              f"{legacy_seconds / pool_seconds:>7.2f}x {str(result['text'] == legacy_text):>10}")
+
+    parse_pool.reset_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
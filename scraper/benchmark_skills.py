@@ -0,0 +1,129 @@
+"""
+Benchmark skill extraction on large resumes and JDs
+Compares the original section heuristics, a naive one-regex-per-alias scan
+over the same gazetteer, and the compiled trie matcher used by main.py.
+
+Usage: python benchmark_skills.py [size_kb ...]
+"""
+
+import random
+import re
+import sys
+import time
+
+from main import extract_jd_structure, extract_resume_structure
+from skill_matcher import DEFAULT_SKILLS_FILE, get_matcher, load_gazetteer
+
+FILLER = ("Worked closely with product and design to deliver features on schedule while "
+          "improving reliability and reducing operating costs across several teams.")
+
+
+def synthetic_resume(size_bytes, seed=0):
+    rng = random.Random(seed)
+    skills = [canonical for canonical, _ in load_gazetteer(DEFAULT_SKILLS_FILE)]
+    parts = ["Jane Doe\nSenior Software Engineer\n", "Skills\n" + ", ".join(rng.sample(skills, 25)) + "\n\nExperience:\n"]
+    size = sum(len(p) for p in parts)
+    while size < size_bytes:
+        line = f"- {FILLER} Built services with {rng.choice(skills)} and {rng.choice(skills)}.\n"
+        parts.append(line)
+        size += len(line)
+    return ''.join(parts)
+
+
+def synthetic_jd(size_bytes, seed=0):
+    rng = random.Random(seed)
+    skills = [canonical for canonical, _ in load_gazetteer(DEFAULT_SKILLS_FILE)]
+    headers = ["## Our Values", "## Requirements", "## Tech Stack", "## Responsibilities", "## About Us"]
+    parts = ["# Senior Engineer\n"]
+    size = len(parts[0])
+    while size < size_bytes:
+        section = [rng.choice(headers)]
+        section.extend(f"- {rng.choice(skills)} experience; {FILLER}" for _ in range(8))
+        block = '\n'.join(section) + '\n'
+        parts.append(block)
+        size += len(block)
+    return ''.join(parts)
+
+
+def legacy_resume_skills(text):
+    """The pre-gazetteer extract_resume_structure skills loop"""
+    skills = []
+    in_skills = False
+    for line in text.split('\n'):
+        clean_line = line.strip()
+        if re.match(r'^(technical )?skills', clean_line, re.IGNORECASE):
+            in_skills = True
+            continue
+        if in_skills:
+            if not clean_line: continue
+            if re.match(r'^[A-Z][a-z]+:', clean_line):
+                in_skills = False
+                continue
+            skills.extend(s.strip() for s in clean_line.split(','))
+    return skills
+
+
+def legacy_jd_skills(markdown_text):
+    """The pre-gazetteer extract_jd_structure section/keyword passes"""
+    structure = {"company_values": [], "required_skills": [], "responsibilities": []}
+    for section in re.split(r'^##+\s+', markdown_text, flags=re.MULTILINE):
+        header_match = re.match(r'([^\n]+)', section)
+        if not header_match:
+            continue
+        header = header_match.group(1).lower()
+        content = section[len(header):].strip()
+        bullets = [line.strip().lstrip('-*•').strip() for line in content.split('\n') if line.strip().startswith(('- ', '* ', '• '))]
+        if any(w in header for w in ['value', 'culture', 'mission']):
+            structure["company_values"].extend(bullets)
+        elif any(w in header for w in ['skill', 'requirement', 'qualif', 'stack', 'tech']):
+            structure["required_skills"].extend(bullets)
+        elif any(w in header for w in ['responsib', 'duties', 'what you will do', 'role']):
+            structure["responsibilities"].extend(bullets)
+    return structure["required_skills"]
+
+
+def naive_scan(patterns, text):
+    """One regex search per alias: cost grows with gazetteer size x text size"""
+    return [canonical for canonical, pattern in patterns if pattern.search(text)]
+
+
+def best_of(func, text, repeats=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    sizes_kb = [int(s) for s in sys.argv[1:]] or [10, 100, 1000]
+
+    start = time.perf_counter()
+    matcher = get_matcher()
+    print(f"Gazetteer: {matcher.skill_count} skills, {matcher.alias_count} aliases, "
+          f"compiled in {time.perf_counter() - start:.3f}s\n")
+
+    patterns = []
+    for canonical, names in load_gazetteer(DEFAULT_SKILLS_FILE):
+        for alias, case_sensitive, _ in names:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            patterns.append((canonical, re.compile(rf'(?<![\w+#.&]){re.escape(alias)}(?![\w+#&])', flags)))
+
+    print(f"{'document':<14} {'legacy (s)':>11} {'naive (s)':>10} {'trie (s)':>9} {'MB/s':>7} {'legacy #':>9} {'trie #':>7}")
+    for size_kb in sizes_kb:
+        for kind, make, legacy, extract in (
+            ('resume', synthetic_resume, legacy_resume_skills, lambda t: extract_resume_structure(t)['skills']),
+            ('jd', synthetic_jd, legacy_jd_skills, lambda t: extract_jd_structure(t)['required_skills']),
+        ):
+            text = make(size_kb * 1024)
+            legacy_seconds, legacy_result = best_of(legacy, text)
+            naive_seconds, _ = best_of(lambda t: naive_scan(patterns, t), text, repeats=1)
+            trie_seconds, trie_result = best_of(extract, text)
+            print(f"{kind + ' ' + str(size_kb) + 'KB':<14} {legacy_seconds:>11.4f} {naive_seconds:>10.3f} {trie_seconds:>9.4f} "
+                  f"{len(text) / trie_seconds / 1e6:>7.1f} {len(legacy_result):>9} {len(trie_result):>7}")
+
+
+if __name__ == "__main__":
+    main()
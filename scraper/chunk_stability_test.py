@@ -0,0 +1,73 @@
+"""
+Editing one resume section must leave every other chunk's hash unchanged,
+and small sections must still share chunks
+
+Usage: python chunk_stability_test.py   (or pytest chunk_stability_test.py)
+"""
+
+from main import resume_sections
+from resume_chunker import chunk_sections
+
+BULLET = "Led migration of service {item} to Python, Docker and Kubernetes on AWS"
+CONTACT_RESUME = """Jane Roe
+Name: Jane Roe
+Email: jane@example.com
+Phone: +1 555 0100
+Location: Berlin
+
+Summary: Backend engineer.
+Skills: Python, Go
+Education:
+BSc Computer Science
+"""
+
+
+def make_sections(summary_lines):
+    return [
+        (None, ['John Doe', 'Software Engineer']),
+        ('Summary', summary_lines),
+        ('Projects', ['Resume parser in Python']),
+        ('Experience', [f"- {BULLET.format(item=item)}" for item in range(1, 41)]),
+        ('Education', ['BSc Computer Science, 2015']),
+        ('Skills', ['Python, C#, .NET, MongoDB, Docker, Kubernetes'])
+    ]
+
+
+def hashes(chunks, without):
+    return {chunk['sha256'] for chunk in chunks if without not in chunk['sections']}
+
+
+def test_edit_keeps_other_chunk_hashes():
+    before = chunk_sections(make_sections(['Backend engineer with 5+ years of experience.']), 64, 16)
+    after = chunk_sections(make_sections([
+        'Backend engineer with 5+ years of experience.',
+        'Built distributed services in Go.'
+    ]), 64, 16)
+
+    # Experience is long enough to be split, so its continuation chunks are covered too
+    assert sum(chunk['sections'] == ['Experience'] for chunk in before) > 1
+    assert hashes(before, 'Summary') == hashes(after, 'Summary')
+    assert not {chunk['sha256'] for chunk in before if 'Summary' in chunk['sections']} & hashes(after, None)
+
+
+def test_small_sections_share_chunks():
+    with open('sample_resume.txt', encoding='utf-8') as f:
+        sample = chunk_sections(resume_sections(f.read()))
+    assert len(sample) <= 2, [chunk['sections'] for chunk in sample]
+
+    contact = chunk_sections(resume_sections(CONTACT_RESUME))
+    assert len(contact) == 1
+    assert contact[0]['sections'] == ['Summary', 'Skills', 'Education']
+    assert 'Email: jane@example.com' in contact[0]['text'].split('\n')
+    assert 'Summary\nBackend engineer.' in contact[0]['text']
+
+    # Never more chunks than one per GROUP_SIZE small sections, plus the split Experience
+    chunks = chunk_sections(make_sections(['Backend engineer.']), 64, 16)
+    experience = sum(chunk['sections'] == ['Experience'] for chunk in chunks)
+    assert len(chunks) - experience <= 2
+
+
+if __name__ == "__main__":
+    test_edit_keeps_other_chunk_hashes()
+    test_small_sections_share_chunks()
+    print('OK: only the edited group changed, small sections share chunks')
@@ -0,0 +1,156 @@
+"""
+Local text embeddings for chunk indexing
+A hashed character n-gram model: every 3-, 4- and 5-character window of the
+lowercased text is hashed into one of EMBED_DIM signed buckets, counts are
+log-scaled and the vector is L2-normalized. No model download and no network
+call. Texts that share words and word pieces ("Python developer", "python
+engineer") land close together, which is what chunk retrieval over resumes and JDs needs.
+
+A whole batch is embedded with array operations: the texts are concatenated
+into one code point array, rolling hashes are computed for every window at
+once, and a single bincount scatters them into the (texts x dim) matrix.
+
+Settings (environment variables):
+- EMBED_DIM: vector size (default 384)
+- EMBED_CACHE_SIZE: cached vectors, keyed by text hash (default 10000)
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+EMBED_DIM = int(os.environ.get('EMBED_DIM', '384'))
+EMBED_CACHE_SIZE = int(os.environ.get('EMBED_CACHE_SIZE', '10000'))
+NGRAM_SIZES = (3, 4, 5)
+# Bump when the hashing or weighting changes; part of the model name and cache key
+MODEL_VERSION = 1
+MODEL_NAME = f"hashed-ngram-v{MODEL_VERSION}-{EMBED_DIM}"
+
+_WHITESPACE = re.compile(r'\s+')
+_HASH_BASE = np.uint64(1099511628211)  # FNV-64 prime
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase, single spaces, padded so the first and last words get edge n-grams"""
+    return f" {_WHITESPACE.sub(' ', text.lower()).strip()} "
+
+
+def embed_texts(texts: list[str], dim: int = EMBED_DIM) -> np.ndarray:
+    """
+    Embed texts without caching
+
+    Returns:
+        float32 array of shape (len(texts), dim), rows L2-normalized (all zeros for empty text)
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    if not texts:
+        return vectors
+
+    normalized = [_normalize_text(text) for text in texts]
+    # surrogatepass: a lone surrogate (valid in JSON strings) is just another code point
+    codes = np.frombuffer(''.join(normalized).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.uint64)
+    lengths = np.fromiter((len(text) for text in normalized), dtype=np.int64, count=len(normalized))
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    buckets = []
+    signs = []
+    bucket_rows = []
+    h = codes.copy()
+    with np.errstate(over='ignore'):
+        # Polynomial rolling hash, wrapping at 2**64: the hash of each n-gram
+        # extends the (n-1)-gram hash starting at the same position
+        for n in range(2, max(NGRAM_SIZES) + 1):
+            count = len(codes) - n + 1
+            if count <= 0:
+                break
+            h = h[:count] * _HASH_BASE + codes[n - 1:n - 1 + count]
+            if n not in NGRAM_SIZES:
+                continue
+            mixed = h * _MIX
+            mixed ^= mixed >> np.uint64(29)
+            # Windows that straddle two texts are dropped
+            same_text = rows[:count] == rows[n - 1:n - 1 + count]
+            mixed = mixed[same_text]
+            # Top 32 bits scaled into [0, dim) (multiply-shift, no division); bit 0 is the sign
+            buckets.append(((mixed >> np.uint64(32)) * np.uint64(dim) >> np.uint64(32)).astype(np.int64))
+            signs.append(1.0 - 2.0 * (mixed & np.uint64(1)).astype(np.float64))
+            bucket_rows.append(rows[:count][same_text])
+
+    if buckets:
+        flat = np.concatenate(bucket_rows) * dim + np.concatenate(buckets)
+        counts = np.bincount(flat, weights=np.concatenate(signs), minlength=len(texts) * dim)
+        matrix = counts.reshape(len(texts), dim)
+        # Sublinear term frequency so repeated boilerplate does not dominate
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        vectors[:] = matrix
+    return vectors
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(f"{MODEL_NAME}:{text}".encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embedding vectors keyed by text hash"""
+
+    def __init__(self, max_entries: int = EMBED_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, texts: list[str]) -> tuple[np.ndarray, int]:
+        """
+        Vectors for texts, embedding only the ones not cached (duplicates in
+        the batch are embedded once)
+
+        Returns:
+            (float32 array of shape (len(texts), EMBED_DIM), number of cache hits)
+        """
+        keys = [text_key(text) for text in texts]
+        vectors = np.empty((len(texts), EMBED_DIM), dtype=np.float32)
+        missing = {}  # key -> indices in this batch
+        with self._lock:
+            for index, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.setdefault(key, []).append(index)
+                else:
+                    self._entries.move_to_end(key)
+                    vectors[index] = vector
+            hits = len(texts) - sum(len(indices) for indices in missing.values())
+            self.hits += hits
+            self.misses += len(texts) - hits
+
+        if missing:
+            fresh = embed_texts([texts[indices[0]] for indices in missing.values()])
+            with self._lock:
+                for (key, indices), vector in zip(missing.items(), fresh):
+                    vectors[indices] = vector
+                    # Copy so a cached row does not pin the whole batch array
+                    self._entries[key] = vector.copy()
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return vectors, hits
+
+    def stats(self) -> dict:
+        """Counters for /health"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'model': MODEL_NAME,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
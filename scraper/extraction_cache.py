@@ -0,0 +1,127 @@
+"""
+Content-addressed cache for resume extraction results
+Keys are the SHA-256 of the uploaded bytes plus the parser version and
+limits, so re-uploading the same resume skips parsing entirely.
+- In-memory LRU bounded by entry count
+- Optional on-disk tier (one JSON file per key, opt-in: it holds resume
+  text and is never evicted) that survives restarts
+
+Same design as voice-service/result_cache.py. The two services are deployed
+separately (each has its own requirements and is started from its own
+folder), so neither imports from the other; fix bugs in both.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_cache_key(file_sha256: str, config: dict) -> str:
+    """Combine the file hash with a stable hash of the parser config"""
+    config_json = json.dumps(config, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f"{file_sha256}:{config_json}".encode('utf-8')).hexdigest()
+
+
+class ExtractionCache:
+    """Thread-safe LRU of extraction results with an optional disk tier"""
+
+    def __init__(self, max_entries: int = 256, disk_dir: str | None = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key: str) -> dict | None:
+        """Return a copy of the cached result, or None"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict):
+        """Store a successful result; failures are never cached"""
+        if not result.get('success'):
+            return
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._remember(key, result)
+        self._write_disk(key, result)
+
+    def stats(self) -> dict:
+        """Counters for /health"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'disk_enabled': bool(self.disk_dir)
+            }
+
+    def _remember(self, key, result):
+        """Insert into the LRU (caller holds the lock)"""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("[RESUME CACHE] Ignoring unreadable entry %s: %s", path, e)
+            return None
+
+    def _write_disk(self, key, result):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            # Atomic rename so readers never see a half-written file
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("[RESUME CACHE] Failed to persist %s: %s", key, e)
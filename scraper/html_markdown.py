@@ -0,0 +1,179 @@
+"""
+Incremental HTML to markdown conversion
+Built on html.parser so the page can be fed chunk by chunk as it downloads:
+no full DOM is ever held, and memory stays proportional to the output.
+Handles the structure job postings use (headings, paragraphs, lists, links,
+emphasis, code). Scripts, styles and page chrome (nav, header, footer,
+forms) are dropped.
+"""
+
+import re
+from html.parser import HTMLParser
+
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'main', 'aside', 'ul', 'ol', 'table', 'tr',
+    'blockquote', 'pre', 'dl', 'dt', 'dd', 'figure', 'figcaption', 'hr', 'br'
+}
+# Contents are never part of the posting
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe'}
+CHROME_TAGS = {'nav', 'header', 'footer', 'form', 'button'}
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col', 'embed', 'source', 'track', 'wbr'}
+
+_SPACES = re.compile(r'[ \t\r\n\f\v]+')
+_BLANK_LINES = re.compile(r'\n{3,}')
+# Indentation is kept only for nested list items (and inside <pre>)
+_NESTED_ITEM = re.compile(r' +(?:-|\d+\.) ')
+
+
+class MarkdownConverter(HTMLParser):
+    """
+    Feed HTML with feed(chunk), then close() and read markdown()/title
+
+    Args:
+        markdown: False produces plain text (no #, -, ** or link syntax)
+        clean: Drop page chrome (nav/header/footer/forms)
+    """
+
+    def __init__(self, markdown: bool = True, clean: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.use_markdown = markdown
+        self.clean = clean
+        self.title = None
+        self._parts = []
+        self._skip_tag = None  # tag that started the skipped region
+        self._skip_depth = 0  # open tags with that same name
+        self._in_title = False
+        self._title_parts = []
+        self._pre_depth = 0
+        self._list_stack = []  # 'ul' or ['ol', next number]
+        self._href_stack = []
+
+    def _emit(self, text):
+        self._parts.append(text)
+
+    def _block_break(self):
+        self._emit('\n\n')
+
+    def handle_starttag(self, tag, attrs):
+        # Only tags named like the one that started the skip are counted: end
+        # tags for li, p, td and the like are optional, so a count of every
+        # tag would never get back to 0
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in SKIPPED_TAGS or (self.clean and tag in CHROME_TAGS):
+            if tag not in VOID_TAGS:
+                self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag == 'title':
+            self._in_title = True
+            return
+
+        md = self.use_markdown
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._block_break()
+            if md:
+                self._emit('#' * int(tag[1]) + ' ')
+        elif tag == 'li':
+            self._emit('\n')
+            indent = '  ' * max(len(self._list_stack) - 1, 0)
+            top = self._list_stack[-1] if self._list_stack else 'ul'
+            if isinstance(top, list):
+                self._emit(f"{indent}{top[1]}. ")
+                top[1] += 1
+            else:
+                self._emit(f"{indent}- ")
+        elif tag in ('ul', 'ol'):
+            # A nested list continues its parent item instead of starting a new block
+            self._emit('' if self._list_stack else '\n\n')
+            self._list_stack.append('ul' if tag == 'ul' else ['ol', 1])
+        elif tag == 'br':
+            self._emit('\n')
+        elif tag == 'hr':
+            self._emit('\n\n---\n\n' if md else '\n\n')
+        elif tag in ('td', 'th'):
+            self._emit(' | ' if md else ' ')
+        elif tag == 'pre':
+            self._pre_depth += 1
+            self._emit('\n\n```\n' if md else '\n\n')
+        elif tag in BLOCK_TAGS:
+            self._block_break()
+        elif md and tag in ('strong', 'b'):
+            self._emit('**')
+        elif md and tag in ('em', 'i'):
+            self._emit('_')
+        elif md and tag == 'code' and not self._pre_depth:
+            self._emit('`')
+        elif md and tag == 'a':
+            href = dict(attrs).get('href') or ''
+            self._href_stack.append(href)
+            if href and not href.startswith(('#', 'javascript:')):
+                self._emit('[')
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag == 'title':
+            self._in_title = False
+            self.title = ' '.join(''.join(self._title_parts).split()) or None
+            return
+
+        md = self.use_markdown
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._block_break()
+        elif tag in ('ul', 'ol'):
+            if self._list_stack:
+                self._list_stack.pop()
+            self._emit('' if self._list_stack else '\n\n')
+        elif tag == 'pre':
+            self._pre_depth = max(self._pre_depth - 1, 0)
+            self._emit('\n```\n\n' if md else '\n\n')
+        elif tag in BLOCK_TAGS:
+            self._block_break()
+        elif md and tag in ('strong', 'b'):
+            self._emit('**')
+        elif md and tag in ('em', 'i'):
+            self._emit('_')
+        elif md and tag == 'code' and not self._pre_depth:
+            self._emit('`')
+        elif md and tag == 'a' and self._href_stack:
+            href = self._href_stack.pop()
+            if href and not href.startswith(('#', 'javascript:')):
+                self._emit(f"]({href})")
+
+    def handle_data(self, data):
+        if self._skip_tag:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+            return
+        if self._pre_depth:
+            self._emit(data)
+        else:
+            self._emit(_SPACES.sub(' ', data))
+
+    def markdown(self) -> str:
+        """Converted text so far, with whitespace tidied per line"""
+        lines = []
+        in_pre = False
+        for line in ''.join(self._parts).split('\n'):
+            if line.strip() == '```':
+                in_pre = not in_pre
+            if in_pre or _NESTED_ITEM.match(line):
+                lines.append(line.rstrip())
+            else:
+                lines.append(line.strip())
+        return _BLANK_LINES.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def html_to_markdown(html: str, markdown: bool = True, clean: bool = True) -> tuple[str, str | None]:
+    """(markdown, title) for a complete HTML string"""
+    converter = MarkdownConverter(markdown=markdown, clean=clean)
+    converter.feed(html)
+    converter.close()
+    return converter.markdown(), converter.title
@@ -0,0 +1,88 @@
+"""
+Local stand-in job board for trying /scrape without hitting real sites
+Serves a sample posting with an ETag and Last-Modified, answers conditional
+requests with 304, and logs every request so cache behaviour is visible.
+
+Usage:
+    python jd_stub_server.py [port]
+    SCRAPE_ALLOW_PRIVATE=1 python main.py
+    curl -X POST http://localhost:8000/scrape -H "Content-Type: application/json" \\
+         -d '{"url": "http://127.0.0.1:8765/jobs/senior-backend"}'
+
+Paths: /jobs/<slug> (cacheable), /slow/<slug> (1 s delay), /nocache/<slug>
+(no validators, Cache-Control: no-store), anything else 404.
+"""
+
+import hashlib
+import sys
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+POSTING = """<!DOCTYPE html>
+<html>
+<head><title>Senior Backend Engineer - Example Corp</title>
+<style>body {{ font-family: sans-serif; }}</style>
+<script>window.analytics = [];</script></head>
+<body>
+<header><p>Example Corp<p>Careers</header>
+<nav><ul><li><a href="/">Home</a><li><a href="/jobs">All jobs</a></ul></nav>
+<main>
+<h1>Senior Backend Engineer ({slug})</h1>
+<p>Example Corp builds <strong>hiring tools</strong> used by thousands of teams.</p>
+<h2>Our Values</h2>
+<ul><li>Ownership from idea to production<li>Kind, direct feedback</ul>
+<h2>Responsibilities</h2>
+<ul><li>Design and run Python services on AWS</li><li>Mentor engineers through code review</li></ul>
+<h2>Requirements</h2>
+<ul><li>5+ years with Python and PostgreSQL</li><li>Docker and Kubernetes in production</li>
+<li>Comfortable owning on-call rotations</li></ul>
+</main>
+<footer>&copy; Example Corp</footer>
+</body>
+</html>
+"""
+
+LAST_MODIFIED = formatdate(time.time(), usegmt=True)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        _, section, *rest = self.path.split('/', 2)
+        slug = rest[0] if rest else ''
+        if section not in ('jobs', 'slow', 'nocache') or not slug:
+            self.send_error(404)
+            return
+        if section == 'slow':
+            time.sleep(1)
+
+        body = POSTING.format(slug=slug).encode('utf-8')
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if section != 'nocache' and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if section == 'nocache':
+            self.send_header('Cache-Control', 'no-store')
+        else:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', LAST_MODIFIED)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port: int = 8765) -> ThreadingHTTPServer:
+    """Start the stand-in server on 127.0.0.1:port (call serve_forever() on the result)"""
+    return ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    print(f"Stand-in job board on http://127.0.0.1:{port}/jobs/<slug>")
+    serve(port).serve_forever()
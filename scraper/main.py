@@ -1,21 +1,69 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
 
 import uvicorn
 import logging
 
+import asyncio
 import io
+import json
+import os
 import re
+import time
+import zipfile
+from contextlib import aclosing, asynccontextmanager
+
+import page_fetcher
+import parse_pool
+import vector_index
+from embedder import MODEL_NAME, EmbeddingCache
+from extraction_cache import ExtractionCache, file_digest, make_cache_key
+from resume_chunker import chunk_sections
+from resume_parser import PARSER_VERSION
+from skill_matcher import get_matcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# /extract/resume/batch limits
+BATCH_MAX_FILES = int(os.environ.get('RESUME_BATCH_MAX_FILES', '100'))
+BATCH_MAX_MB = float(os.environ.get('RESUME_BATCH_MAX_MB', '100'))
+# Uploaded plus decompressed document bytes held for one batch
+BATCH_MAX_TOTAL_MB = float(os.environ.get('RESUME_BATCH_MAX_TOTAL_MB', '200'))
+BATCH_CONCURRENCY = int(os.environ.get('RESUME_BATCH_CONCURRENCY', '0')) or parse_pool.PARSE_WORKERS
+
+# Chunk budget for /extract/resume?chunks=true (approximate tokens)
+CHUNK_MAX_TOKENS = int(os.environ.get('RESUME_CHUNK_TOKENS', '256'))
+CHUNK_OVERLAP_TOKENS = int(os.environ.get('RESUME_CHUNK_OVERLAP', '32'))
+
+# /embed/batch limits
+EMBED_MAX_TEXTS = int(os.environ.get('EMBED_MAX_TEXTS', '512'))
+EMBED_MAX_CHARS = int(os.environ.get('EMBED_MAX_CHARS', '20000'))
+
+# Extraction results by file hash
+# RESUME_CACHE_DIR enables the on-disk tier (full resume text, never evicted)
+resume_cache = ExtractionCache(
+    max_entries=int(os.environ.get('RESUME_CACHE_SIZE', '256')),
+    disk_dir=os.environ.get('RESUME_CACHE_DIR') or None
+)
+
+# Embedding vectors by text hash
+embedding_cache = EmbeddingCache()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    parse_pool.reset_pool()
+    await page_fetcher.close_fetcher()
+
 app = FastAPI(
     title="Resume Extraction Service",
     description="Minimal PDF/DOCX/TXT resume extraction microservice for Interviewly",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -41,6 +89,62 @@ class ScrapeResponse(BaseModel):
     company_values: list[str] = []
     required_skills: list[str] = []
     responsibilities: list[str] = []
+    # Body cut off at SCRAPE_MAX_MB
+    truncated: bool = False
+    # Served from the page cache without downloading it again
+    cached: bool = False
+
+class EmbedBatchRequest(BaseModel):
+    texts: list[str]
+
+class EmbedBatchResponse(BaseModel):
+    # One L2-normalized vector per input text, in request order
+    embeddings: list[list[float]] = []
+    model: str = MODEL_NAME
+    dim: int = 0
+    # Vectors served from the cache instead of being recomputed
+    cached: int = 0
+    success: bool = True
+    error: str | None = None
+
+class IndexAddRequest(BaseModel):
+    # Chunk ids (e.g. DocumentChunk ids); an id already indexed is replaced
+    ids: list[str]
+    # Either texts (embedded with /embed/batch's model) or precomputed embeddings
+    texts: list[str] | None = None
+    embeddings: list[list[float]] | None = None
+    user_id: str | None = None
+
+class IndexQueryRequest(BaseModel):
+    # Either query text or a precomputed query embedding
+    query: str | None = None
+    embedding: list[float] | None = None
+    k: int = 5
+    user_id: str | None = None
+    # Scan only the nearest IVF lists (after POST /index/ivf)
+    approximate: bool = False
+
+class IndexDeleteRequest(BaseModel):
+    ids: list[str] = []
+    # Delete every chunk of this user
+    user_id: str | None = None
+
+class IndexIvfRequest(BaseModel):
+    # Default: square root of the live row count
+    n_lists: int | None = None
+
+class JdExtractionRequest(BaseModel):
+    text: str
+    title: str | None = None
+
+class ResumeChunk(BaseModel):
+    index: int
+    # Section headers the chunk covers (empty for text before the first header)
+    sections: list[str] = []
+    text: str
+    tokens: int
+    # SHA-256 of text: unchanged chunks keep their hash across uploads
+    sha256: str
 
 class ResumeExtractionResponse(BaseModel):
     text: str
@@ -49,11 +153,59 @@ class ResumeExtractionResponse(BaseModel):
     # Structured fields
     skills: list[str] = []
     projects: list[str] = []
+    # Set when limits cut the document short: timeout, page_limit or size_limit
+    truncated: bool = False
+    truncated_reason: str | None = None
+    pages: int | None = None
+    # SHA-256 of the uploaded file, so indexing can skip documents it has already seen
+    sha256: str | None = None
+    cached: bool = False
+    # Ready-to-embed chunks, only when requested with ?chunks=true
+    chunks: list[ResumeChunk] | None = None
 
 # Heuristic extraction helpers
+JD_SECTION_SPLIT = re.compile(r'^##+\s+', re.MULTILINE)
+BULLET_LINE = re.compile(r'^[ \t]*[-*•][ \t]+(.*?)[ \t]*$', re.MULTILINE)
+# Header keywords per JD field, checked in this order
+JD_SECTION_KEYWORDS = [
+    ("company_values", re.compile(r'value|culture|mission')),
+    ("required_skills", re.compile(r'skill|requirement|qualif|stack|tech')),
+    ("responsibilities", re.compile(r'responsib|duties|what you will do|role')),
+]
+SKILLS_HEADER = re.compile(r'^(technical )?skills', re.IGNORECASE)
+SECTION_HEADER = re.compile(r'^[A-Z][a-z]+:')
+# Headings that stand alone on their line
+RESUME_HEADING = re.compile(
+    r'(summary|profile|objective|about me|(work |professional )?experience|employment( history)?|education|'
+    r'projects?|certifications?|awards|achievements|publications|languages|interests|volunteering|'
+    r'(technical )?skills)\s*:?',
+    re.IGNORECASE
+)
+
+def with_unrecognized(skills: list[str], items: list[str]) -> list[str]:
+    """
+    Gazetteer skills followed by the listed items verbatim, except items that
+    are nothing but one known skill ("Python"), which the skills already cover
+    """
+    matcher = get_matcher()
+    seen = set(skills)
+    merged = list(skills)
+    for item in items:
+        item = item.lstrip('-*•').strip()
+        if not item or item in seen:
+            continue
+        mentions = list(matcher.finditer(item))
+        if len(mentions) == 1 and mentions[0][1] == 0 and mentions[0][2] == len(item.rstrip('.')):
+            continue
+        seen.add(item)
+        merged.append(item)
+    return merged
+
 def extract_jd_structure(markdown_text: str) -> dict:
     """
     Heuristic extraction of structured fields from JD markdown
+    required_skills are the gazetteer skills found anywhere in the JD, plus
+    bullets under a skills/requirements header that name no known skill.
     """
     structure = {
         "company_values": [],
@@ -61,64 +213,80 @@ def extract_jd_structure(markdown_text: str) -> dict:
         "responsibilities": []
     }
     
-    # Simple regex-based section finding (naive but better than nothing)
-    # Looking for headers like "Values", "Culture", "Skills", "Requirements", "Responsibilities"
-    
-    sections = re.split(r'^##+\s+', markdown_text, flags=re.MULTILINE)
-    
-    for section in sections:
-        header_match = re.match(r'([^\n]+)', section)
-        if not header_match:
+    # Sections start at "##" headers like "Values", "Skills", "Responsibilities"
+    skill_bullets = []
+    for section in JD_SECTION_SPLIT.split(markdown_text):
+        header, _, content = section.partition('\n')
+        header = header.lower()
+        if not header.strip():
             continue
-            
-        header = header_match.group(1).lower()
-        content = section[len(header):].strip()
         
-        # bullets extraction
-        bullets = [line.strip().lstrip('-*•').strip() for line in content.split('\n') if line.strip().startswith(('- ', '* ', '• '))]
-        
-        if any(w in header for w in ['value', 'culture', 'mission']):
-            structure["company_values"].extend(bullets)
-        elif any(w in header for w in ['skill', 'requirement', 'qualif', 'stack', 'tech']):
-            structure["required_skills"].extend(bullets)
-        elif any(w in header for w in ['responsib', 'duties', 'what you will do', 'role']):
-            structure["responsibilities"].extend(bullets)
-            
+        for field, keywords in JD_SECTION_KEYWORDS:
+            if keywords.search(header):
+                bullets = BULLET_LINE.findall(content)
+                if field == "required_skills":
+                    skill_bullets.extend(bullets)
+                else:
+                    structure[field].extend(bullets)
+                break
+    
+    structure["required_skills"] = with_unrecognized(get_matcher().find(markdown_text), skill_bullets)
     return structure
 
-def extract_resume_structure(text: str) -> dict:
-    """
-    Simple heuristic to find skills in resume text
-    """
-    structure = {
-        "skills": [],
-        "projects": []
-    }
-    
-    # Very basic "Skills" section finding
-    lower_text = text.lower()
-    
-    # Try to find a line starting with "Skills"
-    lines = text.split('\n')
+def skills_section_items(text: str) -> list[str]:
+    """Items listed under a "Skills" / "Technical Skills" line, split on commas"""
+    items = []
     in_skills = False
-    for line in lines:
+    for line in text.split('\n'):
         clean_line = line.strip()
-        if re.match(r'^(technical )?skills', clean_line, re.IGNORECASE):
+        if SKILLS_HEADER.match(clean_line):
             in_skills = True
             continue
         
         if in_skills:
             if not clean_line: continue
-            if re.match(r'^[A-Z][a-z]+:', clean_line): # Next section header?
+            if SECTION_HEADER.match(clean_line): # Next section header?
                 in_skills = False
                 continue
-            # Assume these are skills
-            if ',' in clean_line:
-                skills = [s.strip() for s in clean_line.split(',')]
-                structure["skills"].extend(skills)
-            else:
-                structure["skills"].append(clean_line)
-                
+            items.extend(s.strip() for s in clean_line.split(','))
+    return items
+
+def resume_sections(text: str) -> list[tuple[str | None, list[str]]]:
+    """
+    Lines grouped under section headers, in order: common headings ("Summary",
+    "Experience:", "Skills: Python, Go"), the "Skills" lines
+    skills_section_items() starts at, and any other "Header:" alone on its
+    line. Text after the colon on a heading line belongs to that section.
+    Contact-style "Label: value" lines ("Email: jane@example.com") stay in
+    the current section; lines before the first header come under None.
+    """
+    sections = [(None, [])]
+    for line in text.split('\n'):
+        clean_line = line.strip()
+        header, colon, rest = clean_line.partition(':')
+        header, rest = header.strip(), rest.strip()
+        if RESUME_HEADING.fullmatch(clean_line):
+            sections.append((clean_line.rstrip(':').strip(), []))
+        elif (colon and RESUME_HEADING.fullmatch(header)) or SKILLS_HEADER.match(clean_line) or \
+                (SECTION_HEADER.match(clean_line) and not rest):
+            sections.append((header, [rest] if rest else []))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+def chunk_resume(text: str) -> list[ResumeChunk]:
+    sections = resume_sections(text)
+    return [ResumeChunk(**chunk) for chunk in chunk_sections(sections, CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS)]
+
+def extract_resume_structure(text: str) -> dict:
+    """
+    Skills from the gazetteer anywhere in the resume (canonical names, in order
+    of first mention), plus unrecognized items from a "Skills" section
+    """
+    structure = {
+        "skills": with_unrecognized(get_matcher().find(text), skills_section_items(text)),
+        "projects": []
+    }
     return structure
 
 @app.get("/")
@@ -135,59 +303,419 @@ async def health_check():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "crawler_initialized": True
+        "crawler_initialized": True,
+        "parse_pool": parse_pool.stats(),
+        "resume_cache": resume_cache.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "vector_index": vector_index.stats(),
+        "page_fetcher": page_fetcher.stats()
     }
 
-# URL scraping removed: service only exposes resume extraction (/extract/resume) to keep the microservice minimal and stable.
+@app.post("/scrape", response_model=ScrapeResponse)
+async def scrape_url(request: ScrapeRequest):
+    """
+    Fetch a job posting and extract its structured fields
+    Repeat URLs are answered from the page cache or revalidated with a
+    conditional request (see page_fetcher).
+    """
+    url = str(request.url)
+    logger.info(f"[SCRAPER] Scraping: {url}")
+    try:
+        page = await page_fetcher.get_fetcher().fetch(url, markdown=request.extract_markdown, clean=request.clean_content)
+    except page_fetcher.FetchError as e:
+        logger.warning("[SCRAPER] %s", e)
+        return ScrapeResponse(content="", success=False, error=str(e))
+
+    content = page['content']
+    if len(content.strip()) < 20:
+        return ScrapeResponse(content=content, title=page['title'], success=False, error="Page has no readable content")
+
+    structure = extract_jd_structure(content)
+    logger.info("[SCRAPER] %d chars, %d skills (cache: %s)", len(content), len(structure["required_skills"]), page['cache'])
+    return ScrapeResponse(
+        content=content,
+        title=page['title'],
+        success=True,
+        truncated=page['truncated'],
+        cached=page['cache'] != 'miss',
+        **structure
+    )
+
+def build_resume_response(filename: str, parsed: dict, oversized: bool = False) -> ResumeExtractionResponse:
+    """ResumeExtractionResponse for an extract_document() result"""
+    if 'error' in parsed:
+        logger.error("[RESUME PARSER] %s", parsed['error'])
+        return ResumeExtractionResponse(text="", success=False, error=parsed['error'])
+
+    text = parsed['text']
+    truncated_reason = parsed['truncated_reason'] or ('size_limit' if oversized else None)
+    if truncated_reason:
+        logger.warning("[RESUME PARSER] %s truncated (%s), returning %d chars", filename, truncated_reason, len(text))
+
+    if not text or len(text.strip()) < 20:
+        if truncated_reason == 'timeout':
+            return ResumeExtractionResponse(text=text, success=False, error="Parsing timed out", truncated=True, truncated_reason=truncated_reason)
+        return ResumeExtractionResponse(text=text, success=False, error="File appears to be empty or too short")
+
+    structure = extract_resume_structure(text)
+    logger.info("[RESUME PARSER] Extracted %d chars", len(text))
+    return ResumeExtractionResponse(
+        text=text,
+        success=True,
+        skills=structure['skills'],
+        projects=structure['projects'],
+        truncated=truncated_reason is not None,
+        truncated_reason=truncated_reason,
+        pages=parsed['pages']
+    )
+
+def resume_cache_key(file_sha256: str, kind: str) -> str:
+    """Anything that changes the extracted output is part of the key"""
+    return make_cache_key(file_sha256, {
+        'parser_version': PARSER_VERSION,
+        'kind': kind,
+        'max_pages': parse_pool.MAX_PAGES,
+        'max_chars': parse_pool.MAX_CHARS
+    })
+
+def cache_response(cache_key: str | None, response: ResumeExtractionResponse):
+    # Timeouts depend on load, not on the file, so they are retried next time
+    if cache_key and response.truncated_reason != 'timeout':
+        resume_cache.put(cache_key, response.model_dump(exclude={'sha256', 'cached', 'chunks'}))
+
+def add_chunks(response: ResumeExtractionResponse) -> ResumeExtractionResponse:
+    """Attach chunk_resume() chunks to a successful response (never cached: cheap to rebuild)"""
+    if response.success:
+        response.chunks = chunk_resume(response.text)
+    return response
+
+def ndjson_line(payload: dict) -> str:
+    return json.dumps(payload) + "\n"
+
+async def stream_cached(response: ResumeExtractionResponse):
+    yield ndjson_line({"page": None, "text": response.text})
+    yield ndjson_line({"done": True, **response.model_dump(exclude={'text'})})
+
+async def stream_resume(filename: str, kind: str, content: bytes, oversized: bool, file_sha256: str | None, cache_key: str | None, chunks: bool = False):
+    """
+    NDJSON lines: {"page": n, "text": ...} per PDF page in order as soon as it
+    is extracted ("page": null for DOCX/TXT), then {"done": true, ...} with the
+    rest of the ResumeExtractionResponse fields (the full text is not repeated)
+    """
+    if kind == 'pdf':
+        parsed = None
+        try:
+            deadline = time.time() + parse_pool.PARSE_TIMEOUT
+            async with aclosing(parse_pool.iter_pdf_document(content, deadline)) as items:
+                async for page, item in items:
+                    if page is None:
+                        parsed = item
+                    elif item:
+                        yield ndjson_line({"page": page, "text": item})
+        except Exception as e:
+            parsed = {'error': f"PDF parsing failed: {e}"}
+    else:
+        parsed = await parse_pool.extract_document(kind, content)
+        if parsed.get('text'):
+            yield ndjson_line({"page": None, "text": parsed['text']})
+
+    response = build_resume_response(filename, parsed, oversized)
+    response.sha256 = file_sha256
+    cache_response(cache_key, response)
+    if chunks:
+        add_chunks(response)
+    yield ndjson_line({"done": True, **response.model_dump(exclude={'text'})})
+
+def document_kind(filename: str) -> str | None:
+    """'pdf', 'docx' or 'txt' from the file name, or None if unsupported"""
+    lower = (filename or '').lower()
+    for kind in ('pdf', 'docx', 'txt'):
+        if lower.endswith(f'.{kind}'):
+            return kind
+    return None
+
+def max_upload_bytes() -> int:
+    return int(parse_pool.MAX_FILE_MB * 1024 * 1024)
+
+def check_upload(filename: str, content: bytes):
+    """
+    (kind, content, oversized) for an upload read with max_upload_bytes() + 1,
+    or a failed ResumeExtractionResponse
+    """
+    kind = document_kind(filename)
+    if kind is None:
+        return ResumeExtractionResponse(text="", success=False, error="Only PDF, DOCX, or TXT files are supported")
+    oversized = len(content) > max_upload_bytes()
+    if oversized:
+        if kind != 'txt':
+            return ResumeExtractionResponse(text="", success=False, error=f"File is larger than {parse_pool.MAX_FILE_MB:g} MB")
+        end = max_upload_bytes()
+        # Back up to a character start: a split UTF-8 sequence would send the
+        # whole file down the latin-1 fallback
+        while end > 0 and max_upload_bytes() - end < 3 and content[end] & 0xC0 == 0x80:
+            end -= 1
+        content = content[:end]
+    return kind, content, oversized
+
+async def lookup_cached(filename: str, kind: str, content: bytes, oversized: bool):
+    """(file sha256, cache key, cached response or None)"""
+    # Only whole files are cached: the hash of a cut-off upload is not the file's hash
+    if oversized:
+        return None, None, None
+    file_sha256 = await asyncio.to_thread(file_digest, content)
+    cache_key = resume_cache_key(file_sha256, kind)
+    cached = resume_cache.get(cache_key)
+    if cached is None:
+        return file_sha256, cache_key, None
+    logger.info("[RESUME PARSER] Cache hit for %s (%s)", filename, file_sha256[:12])
+    return file_sha256, cache_key, ResumeExtractionResponse(**cached, sha256=file_sha256, cached=True)
+
+async def extract_resume_content(filename: str, content: bytes) -> ResumeExtractionResponse:
+    """Full /extract/resume pipeline for bytes already read: checks, cache, pool"""
+    checked = check_upload(filename, content)
+    if isinstance(checked, ResumeExtractionResponse):
+        return checked
+    kind, content, oversized = checked
+
+    file_sha256, cache_key, cached = await lookup_cached(filename, kind, content, oversized)
+    if cached is not None:
+        return cached
+
+    parsed = await parse_pool.extract_document(kind, content)
+    response = build_resume_response(filename, parsed, oversized)
+    response.sha256 = file_sha256
+    cache_response(cache_key, response)
+    return response
 
 @app.post("/extract/resume", response_model=ResumeExtractionResponse)
-async def extract_resume(file: UploadFile = File(...)):
+async def extract_resume(file: UploadFile = File(...), stream: bool = False, chunks: bool = False):
+    """
+    Extract resume text; ?stream=true returns NDJSON page by page (see
+    stream_resume), ?chunks=true adds section-based chunks for embedding
+    """
     try:
         logger.info(f"[RESUME PARSER] Starting extraction for: {file.filename}")
-        lower = file.filename.lower()
-        if not (lower.endswith('.pdf') or lower.endswith('.docx') or lower.endswith('.txt')):
-            return ResumeExtractionResponse(text="", success=False, error="Only PDF, DOCX, or TXT files are supported")
+        content = await file.read(max_upload_bytes() + 1)
+        if not stream:
+            response = await extract_resume_content(file.filename, content)
+            return add_chunks(response) if chunks else response
+
+        checked = check_upload(file.filename, content)
+        if isinstance(checked, ResumeExtractionResponse):
+            return checked
+        kind, content, oversized = checked
+
+        file_sha256, cache_key, cached = await lookup_cached(file.filename, kind, content, oversized)
+        if cached is not None:
+            if chunks:
+                add_chunks(cached)
+            return StreamingResponse(stream_cached(cached), media_type="application/x-ndjson")
+        return StreamingResponse(
+            stream_resume(file.filename, kind, content, oversized, file_sha256, cache_key, chunks),
+            media_type="application/x-ndjson"
+        )
+    except Exception as e:
+        logger.error("Resume extraction exception: %s", e, exc_info=True)
+        return ResumeExtractionResponse(text="", success=False, error=str(e))
+
+@app.post("/extract/jd", response_model=ScrapeResponse)
+async def extract_jd(request: JdExtractionRequest):
+    """Structured fields (values, skills, responsibilities) from JD text or markdown"""
+    if not request.text.strip():
+        return ScrapeResponse(content="", title=request.title, success=False, error="Text is required")
+    structure = extract_jd_structure(request.text)
+    logger.info("[JD PARSER] %d chars, %d skills", len(request.text), len(structure["required_skills"]))
+    return ScrapeResponse(content=request.text, title=request.title, success=True, **structure)
+
+@app.post("/embed/batch", response_model=EmbedBatchResponse)
+async def embed_batch(request: EmbedBatchRequest):
+    """
+    Embed many texts (e.g. every chunk of a resume) in one call with the
+    local hashed n-gram model (see embedder.py); repeated texts come from the cache
+    """
+    if len(request.texts) > EMBED_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {EMBED_MAX_TEXTS} texts per batch")
+    too_long = next((i for i, text in enumerate(request.texts) if len(text) > EMBED_MAX_CHARS), None)
+    if too_long is not None:
+        raise HTTPException(status_code=413, detail=f"Text {too_long} is longer than {EMBED_MAX_CHARS} characters")
+
+    vectors, cached = await asyncio.to_thread(embedding_cache.embed, request.texts)
+    logger.info("[EMBEDDINGS] Embedded %d text(s), %d from cache", len(request.texts), cached)
+    return EmbedBatchResponse(
+        embeddings=vectors.round(6).tolist(),
+        dim=vectors.shape[1],
+        cached=cached
+    )
 
-        content = await file.read()
-        text = ""
+@app.post("/index/add")
+async def index_add(request: IndexAddRequest):
+    """Append chunks to the vector index (see vector_index.py)"""
+    if (request.texts is None) == (request.embeddings is None):
+        raise HTTPException(status_code=400, detail="Send either texts or embeddings")
+    items = request.texts if request.texts is not None else request.embeddings
+    if not items:
+        raise HTTPException(status_code=400, detail="Nothing to add")
+    if len(items) != len(request.ids):
+        raise HTTPException(status_code=400, detail="One id is needed per text or embedding")
+    if len(request.ids) > EMBED_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {EMBED_MAX_TEXTS} chunks per request")
 
-        if lower.endswith('.pdf'):
+    if request.texts is not None:
+        vectors, _ = await asyncio.to_thread(embedding_cache.embed, request.texts)
+    else:
+        vectors = request.embeddings
+    index = vector_index.get_index()
+    try:
+        added = await asyncio.to_thread(index.add, request.ids, vectors, request.user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info("[VECTOR INDEX] Added %d chunk(s) for user %s", added, request.user_id)
+    return {"success": True, "added": added, **index.stats()}
+
+@app.post("/index/query")
+async def index_query(request: IndexQueryRequest):
+    """Top-k chunks by cosine similarity: [{"id", "score", "user_id"}] best first"""
+    if (request.query is None) == (request.embedding is None):
+        raise HTTPException(status_code=400, detail="Send either query or embedding")
+    if request.query is not None:
+        vectors, _ = await asyncio.to_thread(embedding_cache.embed, [request.query])
+        query = vectors[0]
+    else:
+        query = request.embedding
+    try:
+        results = await asyncio.to_thread(
+            vector_index.get_index().search, query, request.k, request.user_id, request.approximate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "results": results}
+
+@app.post("/index/delete")
+async def index_delete(request: IndexDeleteRequest):
+    """Delete chunks by id and/or all chunks of a user"""
+    deleted = await asyncio.to_thread(vector_index.get_index().delete, request.ids, request.user_id)
+    logger.info("[VECTOR INDEX] Deleted %d chunk(s)", deleted)
+    return {"success": True, "deleted": deleted}
+
+@app.post("/index/ivf")
+async def index_build_ivf(request: IndexIvfRequest):
+    """(Re)build the IVF lists used by approximate queries"""
+    index = vector_index.get_index()
+    try:
+        lists = await asyncio.to_thread(index.build_ivf, request.n_lists)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info("[VECTOR INDEX] Built %d IVF lists", lists)
+    return {"success": True, **index.stats()}
+
+def read_zip(zip_name: str, data: bytes, max_files: int, max_bytes: int) -> list[tuple[str, bytes | None, str | None]]:
+    """
+    (name, content, error) for every file in a ZIP, skipping folders and OS metadata
+    Raises 413 before reading anything if the ZIP has more than max_files
+    files; members past max_bytes of decompressed data get a per-file error.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as e:
+        return [(zip_name, None, f"Invalid ZIP archive: {e}")]
+
+    documents = []
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not (info.is_dir() or info.filename.startswith('__MACOSX/') or info.filename.rsplit('/', 1)[-1].startswith('.'))
+        ]
+        if len(members) > max_files:
+            raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_FILES} files per batch")
+        for info in members:
+            name = info.filename
+            if document_kind(name) is None:
+                documents.append((name, None, "Only PDF, DOCX, or TXT files are supported"))
+                continue
+            if max_bytes <= 0:
+                documents.append((name, None, f"Batch exceeds {BATCH_MAX_TOTAL_MB:g} MB of extracted files"))
+                continue
             try:
-                from pypdf import PdfReader
-                pdf_file = io.BytesIO(content)
-                reader = PdfReader(pdf_file)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + '\n'
-            except Exception as e:
-                logger.error("PDF parsing failed: %s", e)
-                return ResumeExtractionResponse(text="", success=False, error=f"PDF parsing failed: {e}")
-        elif lower.endswith('.docx'):
+                # Bounded read: the header's file_size cannot be trusted
+                with archive.open(info) as f:
+                    content = f.read(min(max_upload_bytes() + 1, max_bytes + 1))
+            except (zipfile.BadZipFile, RuntimeError, OSError) as e:
+                documents.append((name, None, f"Could not read from ZIP: {e}"))
+                continue
+            if len(content) > max_bytes:
+                # Stop here: later members are not decompressed at all
+                max_bytes = 0
+                documents.append((name, None, f"Batch exceeds {BATCH_MAX_TOTAL_MB:g} MB of extracted files"))
+                continue
+            max_bytes -= len(content)
+            documents.append((name, content, None))
+    return documents
+
+async def stream_batch(documents: list[tuple[str, bytes | None, str | None]]):
+    """
+    Extract documents at most BATCH_CONCURRENCY at a time, yielding one NDJSON
+    line per file as it finishes, then a summary line
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(index, filename, content, error):
+        if error:
+            return index, filename, ResumeExtractionResponse(text="", success=False, error=error)
+        async with semaphore:
             try:
-                from docx import Document
-                doc = Document(io.BytesIO(content))
-                paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-                text = '\n'.join(paragraphs)
+                return index, filename, await extract_resume_content(filename, content)
             except Exception as e:
-                logger.error("DOCX parsing failed: %s", e)
-                return ResumeExtractionResponse(text="", success=False, error=f"DOCX parsing failed: {e}")
-        else:
-            # TXT
-            try:
-                text = content.decode('utf-8')
-            except UnicodeDecodeError:
-                text = content.decode('latin-1')
+                # One bad file must not take the rest of the batch down
+                logger.error("[RESUME BATCH] %s failed: %s", filename, e, exc_info=True)
+                return index, filename, ResumeExtractionResponse(text="", success=False, error=str(e))
 
-        if not text or len(text.strip()) < 20:
-            return ResumeExtractionResponse(text=text, success=False, error="File appears to be empty or too short")
+    tasks = [asyncio.ensure_future(run(i, *document)) for i, document in enumerate(documents)]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, filename, response = await next_done
+            succeeded += response.success
+            yield ndjson_line({"index": index, "filename": filename, **response.model_dump()})
+    finally:
+        # Client went away: stop the files not started yet
+        for task in tasks:
+            task.cancel()
+    yield ndjson_line({"done": True, "count": len(documents), "succeeded": succeeded, "failed": len(documents) - succeeded})
 
-        structure = extract_resume_structure(text)
-        logger.info("[RESUME PARSER] Extracted %d chars", len(text))
-        return ResumeExtractionResponse(text=text, success=True, skills=structure['skills'], projects=structure['projects'])
-    except Exception as e:
-        logger.error("Resume extraction exception: %s", e, exc_info=True)
-        return ResumeExtractionResponse(text="", success=False, error=str(e))
+@app.post("/extract/resume/batch")
+async def extract_resume_batch(files: list[UploadFile] = File(...)):
+    """
+    Extract many resumes in one request: several multipart `files`, or a ZIP
+    Streams NDJSON, one {"index", "filename", ...ResumeExtractionResponse}
+    line per file in completion order, then {"done": true, "count",
+    "succeeded", "failed"}. Failures are reported per file.
+    """
+    documents = []
+    # Everything read is held until the batch finishes, so cap the total too
+    remaining_bytes = int(BATCH_MAX_TOTAL_MB * 1024 * 1024)
+    for upload in files:
+        if len(documents) >= BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_FILES} files per batch")
+        if (upload.filename or '').lower().endswith('.zip'):
+            max_zip_bytes = int(BATCH_MAX_MB * 1024 * 1024)
+            data = await upload.read(max_zip_bytes + 1)
+            if len(data) > max_zip_bytes:
+                documents.append((upload.filename, None, f"ZIP is larger than {BATCH_MAX_MB:g} MB"))
+                continue
+            members = await asyncio.to_thread(read_zip, upload.filename, data, BATCH_MAX_FILES - len(documents), remaining_bytes)
+            remaining_bytes -= sum(len(content) for _, content, _ in members if content)
+            documents.extend(members)
+            continue
+        content = await upload.read(min(max_upload_bytes() + 1, remaining_bytes + 1))
+        if len(content) > remaining_bytes:
+            remaining_bytes = 0
+            documents.append((upload.filename, None, f"Batch exceeds {BATCH_MAX_TOTAL_MB:g} MB of extracted files"))
+            continue
+        remaining_bytes -= len(content)
+        documents.append((upload.filename, content, None))
+
+    logger.info("[RESUME BATCH] Extracting %d file(s)", len(documents))
+    return StreamingResponse(stream_batch(documents), media_type="application/x-ndjson")
 
 @app.post("/scrape/simple")
 async def scrape_simple(url: str):
@@ -197,9 +725,11 @@ async def scrape_simple(url: str):
     try:
         request = ScrapeRequest(url=url)
         result = await scrape_url(request)
-        return {"content": result.content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not result.success:
+        raise HTTPException(status_code=502, detail=result.error)
+    return {"content": result.content}
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -1,10 +1,74 @@
+"""
+Resume DOCX files for tests and benchmarks
+
+Usage: python make_docx.py                        (writes sample_resume.docx)
+       python make_docx.py [sections] [output.docx]  (synthetic long resume)
+"""
+
+import copy
+import io
+import sys
+
 from docx import Document
+from docx.oxml.ns import qn
+
+BULLET = "Section {section} item {item}: Led migration of services to Python, Docker and Kubernetes on AWS"
+
+
+def make_sample(path: str = 'sample_resume.docx'):
+    doc = Document()
+    doc.add_heading('John Doe', level=1)
+    doc.add_paragraph('Software Engineer')
+    doc.add_paragraph('Experienced backend engineer with 5+ years building distributed services in .NET and Python. Skilled in system design, microservices, and databases.')
+    doc.add_heading('Skills', level=2)
+    doc.add_paragraph('Python, C#, .NET, MongoDB, Docker, Kubernetes, REST, CI/CD')
+    doc.save(path)
+
+
+def make_docx(sections: int, items_per_section: int = 20) -> bytes:
+    """
+    A resume with `sections` experience sections, each a heading, bullet
+    paragraphs and a two-column skills table, plus a header and footer
+    (the parts python-docx's doc.paragraphs never reads)
+    """
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "John Doe | john@example.com | +1 555 0100"
+    doc.sections[0].footer.paragraphs[0].text = "References available on request"
+    doc.add_heading('John Doe', level=1)
+
+    body = doc.element.body
+    first = len(body)
+    doc.add_heading('Experience 1', level=2)
+    for item in range(1, items_per_section + 1):
+        doc.add_paragraph(BULLET.format(section=1, item=item), style='List Bullet')
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Languages'
+    table.cell(0, 1).text = 'Python, Go, TypeScript'
+    table.cell(1, 0).text = 'Platforms'
+    table.cell(1, 1).text = 'AWS, Kubernetes, PostgreSQL'
+
+    # python-docx gets slow on long documents, so later sections are copies
+    # of the first one's XML with the numbers changed
+    section_properties = body[-1]
+    template = list(body)[first:-1]
+    for section in range(2, sections + 1):
+        for element in template:
+            element = copy.deepcopy(element)
+            for text in element.iter(qn('w:t')):
+                text.text = text.text.replace('Experience 1', f'Experience {section}').replace('Section 1 ', f'Section {section} ')
+            section_properties.addprevious(element)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
 
-doc = Document()
-doc.add_heading('John Doe', level=1)
-doc.add_paragraph('Software Engineer')
-doc.add_paragraph('Experienced backend engineer with 5+ years building distributed services in .NET and Python. Skilled in system design, microservices, and databases.')
-doc.add_heading('Skills', level=2)
-doc.add_paragraph('Python, C#, .NET, MongoDB, Docker, Kubernetes, REST, CI/CD')
-doc.save('sample_resume.docx')
-print('sample_resume.docx created')
\ No newline at end of file
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        output = sys.argv[2] if len(sys.argv) > 2 else 'synthetic_resume.docx'
+        with open(output, 'wb') as f:
+            f.write(make_docx(int(sys.argv[1])))
+        print(f"{output} created")
+    else:
+        make_sample()
+        print('sample_resume.docx created')
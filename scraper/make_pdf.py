@@ -0,0 +1,51 @@
+"""
+Synthetic multi-page resume PDFs for benchmarks (no PDF library needed)
+
+Usage: python make_pdf.py [pages] [output.pdf]
+"""
+
+import sys
+
+LINE = "Page {page} line {line}: Led migration of services to Python, Docker and Kubernetes on AWS"
+
+
+def make_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """A valid PDF with `pages` pages of Helvetica text lines"""
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(1, pages + 1):
+        ops = ["BT /F1 10 Tf 40 800 Td 16 TL"]
+        ops.extend(f"({LINE.format(page=page, line=line)}) Tj T*" for line in range(1, lines_per_page + 1))
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append((
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        ).encode('latin-1'))
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = ' '.join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode('latin-1')
+
+    parts = [b"%PDF-1.4\n"]
+    offsets = []
+    size = len(parts[0])
+    for number, body in enumerate(objects, 1):
+        chunk = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        offsets.append(size)
+        parts.append(chunk)
+        size += len(chunk)
+    xref = [f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"]
+    xref.extend(f"{offset:010d} 00000 n \n" for offset in offsets)
+    xref.append(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{size}\n%%EOF\n")
+    parts.append(''.join(xref).encode('latin-1'))
+    return b''.join(parts)
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    path = sys.argv[2] if len(sys.argv) > 2 else 'sample_resume.pdf'
+    with open(path, 'wb') as f:
+        f.write(make_pdf(pages))
+    print(f'{path} created ({pages} pages)')
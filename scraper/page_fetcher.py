@@ -0,0 +1,322 @@
+"""
+Pooled, cached fetcher for job posting URLs
+One shared httpx.AsyncClient keeps connections alive across requests, a
+semaphore per host stops a burst of pasted links from hammering one job
+board, and the body is converted to markdown chunk by chunk as it arrives.
+Converted pages are cached per URL with their ETag/Last-Modified, so a URL
+seen before is revalidated with a conditional request and a 304 reuses the
+cached markdown without downloading or parsing the page again. Identical
+URLs fetched at the same time share a single download.
+
+Settings (environment variables):
+- SCRAPE_MAX_CONNECTIONS: pooled connections across all hosts (default 20)
+- SCRAPE_PER_HOST_LIMIT: concurrent requests to one host (default 4)
+- SCRAPE_TIMEOUT: seconds per request (default 15)
+- SCRAPE_MAX_MB: body size read before the page is cut off (default 5)
+- SCRAPE_CACHE_SIZE: cached pages (default 256)
+- SCRAPE_FRESH_SECONDS: reuse a cached page without revalidating it (default 300,
+  lowered by the page's Cache-Control max-age, 0 for no-cache)
+- SCRAPE_ALLOW_PRIVATE: allow localhost and private addresses (default off;
+  set it to test against a local stand-in server, see jd_stub_server.py)
+
+Private targets are refused twice: literal hosts (including numeric forms
+such as 2130706433 or 0x7f.1) before the request, and every address a host
+name resolves to when the connection is opened. The connection then goes to
+the address that was checked, so a second DNS answer cannot swap it for a
+private one.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import os
+import re
+import socket
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from html_markdown import MarkdownConverter
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.environ.get('SCRAPE_MAX_CONNECTIONS', '20'))
+PER_HOST_LIMIT = int(os.environ.get('SCRAPE_PER_HOST_LIMIT', '4'))
+FETCH_TIMEOUT = float(os.environ.get('SCRAPE_TIMEOUT', '15'))
+MAX_BODY_MB = float(os.environ.get('SCRAPE_MAX_MB', '5'))
+CACHE_SIZE = int(os.environ.get('SCRAPE_CACHE_SIZE', '256'))
+FRESH_SECONDS = float(os.environ.get('SCRAPE_FRESH_SECONDS', '300'))
+ALLOW_PRIVATE = os.environ.get('SCRAPE_ALLOW_PRIVATE', '').lower() in ('1', 'true', 'yes')
+
+USER_AGENT = "Mozilla/5.0 (compatible; InterviewlyScraper/1.0)"
+HTML_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+_MAX_AGE = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+class FetchError(Exception):
+    """A page that could not be fetched; the message is safe to return to clients"""
+
+
+def _ip_address(host: str):
+    """host as an IP address, including the legacy IPv4 forms inet_aton accepts ("127.1", "0x7f.0.0.1"), or None"""
+    try:
+        return ipaddress.ip_address(host)
+    except ValueError:
+        pass
+    try:
+        return ipaddress.IPv4Address(socket.inet_aton(host))
+    except OSError:
+        return None
+
+
+def _is_public(address) -> bool:
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def _check_host(url: httpx.URL):
+    """Refuse localhost and non-public literal addresses unless SCRAPE_ALLOW_PRIVATE is set"""
+    if ALLOW_PRIVATE:
+        return
+    host = url.host.rstrip('.').lower()
+    if host == 'localhost' or host.endswith('.localhost'):
+        raise FetchError(f"Refusing to fetch private address {host}")
+    address = _ip_address(host)
+    if address is not None and not _is_public(address):
+        raise FetchError(f"Refusing to fetch private address {host}")
+
+
+class _PrivateAddressError(httpcore.ConnectError):
+    """Raised while connecting; httpx passes it on as a ConnectError"""
+
+
+class _PublicAddressBackend(httpcore.AsyncNetworkBackend):
+    """
+    Resolves the host itself, refuses it if any address is not public, and
+    connects to the checked address. TLS still verifies the original host
+    name, which httpcore passes separately as the SNI hostname.
+    """
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        for address in addresses:
+            if not _is_public(ipaddress.ip_address(address.split('%', 1)[0])):
+                raise _PrivateAddressError(f"Refusing to fetch {host}: it resolves to private address {address}")
+
+        error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Unix sockets are not allowed")
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+def _make_transport() -> httpx.AsyncHTTPTransport:
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    )
+    if not ALLOW_PRIVATE:
+        # httpx has no public option for the network backend; its pool takes one
+        transport._pool._network_backend = _PublicAddressBackend()
+    return transport
+
+
+def _fresh_seconds(headers: httpx.Headers) -> float | None:
+    """How long a response may be reused without revalidation, or None if it must not be stored"""
+    cache_control = headers.get('cache-control', '').lower()
+    if 'no-store' in cache_control:
+        return None
+    if 'no-cache' in cache_control:
+        return 0.0
+    max_age = _MAX_AGE.search(cache_control)
+    if max_age:
+        return min(float(max_age.group(1)), FRESH_SECONDS)
+    return FRESH_SECONDS
+
+
+class PageFetcher:
+    """Fetches URLs as markdown through one shared client and a conditional-request cache"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self._client = httpx.AsyncClient(
+            transport=transport or _make_transport(),
+            timeout=FETCH_TIMEOUT,
+            # Proxies from the environment would connect for us, past the address check
+            trust_env=False,
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT, 'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.5'},
+            # Runs for every hop, so a redirect cannot reach a private address either
+            event_hooks={'request': [self._before_request]}
+        )
+        self._host_limits = {}
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    async def _before_request(self, request: httpx.Request):
+        _check_host(request.url)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        """Counters for /health"""
+        return {
+            'cached_pages': len(self._cache),
+            'fresh_hits': self.fresh_hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'in_flight': len(self._in_flight),
+            'hosts': len(self._host_limits)
+        }
+
+    async def fetch(self, url: str, markdown: bool = True, clean: bool = True) -> dict:
+        """
+        Page at url converted to markdown (or plain text)
+
+        Returns:
+            dict with content, title, truncated and cache ('fresh', 'revalidated' or 'miss')
+
+        Raises:
+            FetchError: bad URL, network failure, HTTP error or non-HTML content
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise FetchError("Only http and https URLs are supported")
+
+        key = (url, markdown, clean)
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() < entry['fresh_until']:
+            self._cache.move_to_end(key)
+            self.fresh_hits += 1
+            return self._page(entry, 'fresh')
+
+        # Someone is already fetching this exact page: wait for their result
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download(key, parts.hostname.lower(), entry))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _download(self, key, host, entry) -> dict:
+        url, markdown, clean = key
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        semaphore = self._host_limits.setdefault(host, asyncio.Semaphore(PER_HOST_LIMIT))
+        async with semaphore:
+            try:
+                async with self._client.stream('GET', url, headers=headers) as response:
+                    if response.status_code == 304 and entry is not None:
+                        self.revalidated += 1
+                        self._store(key, entry, response.headers)
+                        logger.info("[SCRAPER] %s not modified, using cached page", url)
+                        return self._page(entry, 'revalidated')
+                    if response.status_code >= 400:
+                        raise FetchError(f"{url} returned HTTP {response.status_code}")
+                    content_type = response.headers.get('content-type', 'text/html').split(';')[0].strip().lower()
+                    if content_type not in HTML_TYPES:
+                        raise FetchError(f"Unsupported content type: {content_type}")
+
+                    self.misses += 1
+                    converter = MarkdownConverter(markdown=markdown, clean=clean)
+                    plain_parts = []
+                    feed = plain_parts.append if content_type == 'text/plain' else converter.feed
+                    truncated = False
+                    max_bytes = MAX_BODY_MB * 1024 * 1024
+                    async for chunk in response.aiter_text():
+                        feed(chunk)
+                        if response.num_bytes_downloaded > max_bytes:
+                            truncated = True
+                            logger.warning("[SCRAPER] %s is larger than %g MB, cutting it off", url, MAX_BODY_MB)
+                            break
+                    converter.close()
+                    entry = {
+                        'content': ''.join(plain_parts).strip() if plain_parts else converter.markdown(),
+                        'title': converter.title,
+                        'truncated': truncated,
+                        'etag': response.headers.get('etag'),
+                        'last_modified': response.headers.get('last-modified')
+                    }
+                    self._store(key, entry, response.headers)
+                    logger.info("[SCRAPER] Fetched %s (%d bytes, %d chars)", url, response.num_bytes_downloaded, len(entry['content']))
+                    return self._page(entry, 'miss')
+            except httpx.TimeoutException:
+                raise FetchError(f"Timed out fetching {url}")
+            except httpx.ConnectError as e:
+                if isinstance(e.__cause__, _PrivateAddressError):
+                    raise FetchError(str(e.__cause__))
+                raise FetchError(f"Failed to fetch {url}: {e}")
+            except httpx.HTTPError as e:
+                raise FetchError(f"Failed to fetch {url}: {e}")
+
+    def _store(self, key, entry, headers: httpx.Headers):
+        fresh_seconds = _fresh_seconds(headers)
+        if fresh_seconds is None:
+            self._cache.pop(key, None)
+            return
+        entry['fresh_until'] = time.monotonic() + fresh_seconds
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _page(entry, cache):
+        return {
+            'content': entry['content'],
+            'title': entry['title'],
+            'truncated': entry['truncated'],
+            'cache': cache
+        }
+
+
+_fetcher = None
+
+
+def get_fetcher() -> PageFetcher:
+    """Shared fetcher, created on first use inside the event loop"""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = PageFetcher()
+    return _fetcher
+
+
+def stats() -> dict:
+    if _fetcher is None:
+        return {'started': False}
+    return {'started': True, **_fetcher.stats()}
+
+
+async def close_fetcher():
+    global _fetcher
+    if _fetcher is not None:
+        await _fetcher.aclose()
+        _fetcher = None
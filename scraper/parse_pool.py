@@ -0,0 +1,223 @@
+"""
+Process pool for resume parsing
+Keeps pypdf/python-docx work off the event loop. PDFs are split into page
+ranges so one long document uses every worker, and the ranges come back in
+page order.
+
+Settings (environment variables):
+- RESUME_PARSE_WORKERS: parser processes (default: CPU count)
+- RESUME_PARSE_TIMEOUT: seconds per document (default 20)
+- RESUME_MAX_PAGES: PDF pages read (default 50)
+- RESUME_MAX_FILE_MB: upload size (default 10)
+- RESUME_MAX_CHARS: characters returned (default 200000)
+- RESUME_PAGES_PER_TASK: smallest page range given to one worker (default 8)
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing
+
+from resume_parser import join_pages, parse_document, parse_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+PARSE_WORKERS = int(os.environ.get('RESUME_PARSE_WORKERS', '0')) or os.cpu_count() or 1
+PARSE_TIMEOUT = float(os.environ.get('RESUME_PARSE_TIMEOUT', '20'))
+MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', '50'))
+MAX_FILE_MB = float(os.environ.get('RESUME_MAX_FILE_MB', '10'))
+MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', '200000'))
+PAGES_PER_TASK = int(os.environ.get('RESUME_PAGES_PER_TASK', '8'))
+# Extra wait past the deadline before giving up on a worker that stopped checking it
+PARSE_GRACE_SECONDS = 5
+
+_pool = None
+_in_flight = 0
+_recycled = 0
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Created on first use; spawned workers only import resume_parser"""
+    global _pool
+    if _pool is None:
+        logger.info("[RESUME PARSER] Starting %d parse worker(s)", PARSE_WORKERS)
+        _pool = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _pool
+
+
+def reset_pool():
+    """Drop a broken pool (a worker died); the next request starts a fresh one"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def recycle_pool(pool: ProcessPoolExecutor):
+    """
+    Retire a pool whose worker is stuck past a deadline: later tasks go to a
+    fresh pool, and the old pool's processes are killed once every task it
+    was given is past its own deadline, so other requests' tasks can finish
+    """
+    global _pool, _recycled
+    if _pool is not pool:
+        return
+    logger.warning("[RESUME PARSER] A parse task overran its deadline, replacing the worker pool")
+    _pool = None
+    _recycled += 1
+    # shutdown() forgets the processes, so take them first
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False)
+    asyncio.get_running_loop().call_later(PARSE_TIMEOUT + PARSE_GRACE_SECONDS, _terminate, processes)
+
+
+def _terminate(processes):
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def stats() -> dict:
+    return {
+        'workers': PARSE_WORKERS,
+        'started': _pool is not None,
+        'in_flight': _in_flight,
+        'recycled': _recycled
+    }
+
+
+async def run_in_pool(func, *args, deadline: float):
+    """
+    func(*args) in a worker without blocking the event loop
+    Raises asyncio.TimeoutError once deadline (plus grace) has passed, after
+    recycling the pool so the stuck worker cannot hold its slot, and resets
+    the pool before re-raising BrokenProcessPool.
+    """
+    global _in_flight
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    _in_flight += 1
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(pool, func, *args),
+            timeout=max(deadline - time.time(), 0) + PARSE_GRACE_SECONDS
+        )
+    except asyncio.TimeoutError:
+        recycle_pool(pool)
+        raise
+    except BrokenProcessPool:
+        reset_pool()
+        raise
+    finally:
+        _in_flight -= 1
+
+
+def _page_ranges(start, stop):
+    """Split [start, stop) into at least PAGES_PER_TASK-page ranges, about two per worker"""
+    size = max(PAGES_PER_TASK, math.ceil((stop - start) / (2 * PARSE_WORKERS)))
+    return [(first, min(first + size, stop)) for first in range(start, stop, size)]
+
+
+async def iter_pdf_pages(content: bytes, deadline: float):
+    """
+    Yield parse_pdf_pages() chunks in page order as they finish
+    The first range doubles as the page count probe, so a short resume is a
+    single task. Longer PDFs fan the remaining ranges out over the pool.
+    Stops after a chunk that was truncated; pages past MAX_PAGES are never read.
+    """
+    first = await run_in_pool(parse_pdf_pages, content, 0, min(PAGES_PER_TASK, MAX_PAGES), deadline, MAX_CHARS, deadline=deadline)
+    yield first
+    if first['truncated_reason']:
+        return
+
+    ranges = _page_ranges(len(first['pages']), min(first['total_pages'], MAX_PAGES))
+    tasks = [
+        asyncio.ensure_future(run_in_pool(parse_pdf_pages, content, start, stop, deadline, MAX_CHARS, deadline=deadline))
+        for start, stop in ranges
+    ]
+    try:
+        for task in tasks:
+            chunk = await task
+            yield chunk
+            if chunk['truncated_reason']:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def iter_pdf_document(content: bytes, deadline: float):
+    """
+    Yield (page number, text) for each page in order, then (None, result)
+    where result is the extract_document() dict for the whole PDF. Text is
+    cut at MAX_CHARS, and a page that stalls past the deadline ends the
+    document as a timeout, keeping the pages already read.
+    """
+    pages = []
+    reason = None
+    total_pages = None
+    chars = 0
+    try:
+        async with aclosing(iter_pdf_pages(content, deadline)) as chunks:
+            async for chunk in chunks:
+                total_pages = chunk['total_pages']
+                reason = chunk['truncated_reason']
+                for offset, page_text in enumerate(chunk['pages']):
+                    cut = chars + len(page_text) + 1 > MAX_CHARS
+                    if cut:
+                        page_text = page_text[:max(MAX_CHARS - chars - 1, 0)]
+                        reason = 'size_limit'
+                    pages.append(page_text)
+                    chars += (len(page_text) + 1) if page_text else 0
+                    yield chunk['start'] + offset + 1, page_text
+                    if cut:
+                        break
+                if reason:
+                    break
+    except asyncio.TimeoutError:
+        reason = 'timeout'
+    if reason is None and total_pages and total_pages > MAX_PAGES:
+        reason = 'page_limit'
+
+    yield None, {
+        'text': join_pages(pages),
+        'pages': total_pages,
+        'truncated': reason is not None,
+        'truncated_reason': reason
+    }
+
+
+async def extract_pdf(content: bytes, deadline: float) -> dict:
+    async with aclosing(iter_pdf_document(content, deadline)) as items:
+        async for page, result in items:
+            if page is None:
+                return result
+
+
+async def extract_document(kind: str, content: bytes) -> dict:
+    """
+    Text of a 'pdf', 'docx' or 'txt' upload, parsed in the pool
+
+    Returns:
+        dict with text, pages, truncated and truncated_reason, or error
+    """
+    deadline = time.time() + PARSE_TIMEOUT
+    try:
+        if kind == 'pdf':
+            return await extract_pdf(content, deadline)
+        return await run_in_pool(parse_document, kind, content, deadline, MAX_PAGES, MAX_CHARS, deadline=deadline)
+    except asyncio.TimeoutError:
+        # Stuck inside a single page/part; nothing usable came back
+        return {'text': '', 'pages': None, 'truncated': True, 'truncated_reason': 'timeout'}
+    except BrokenProcessPool:
+        return {'error': f"{kind.upper()} parsing failed: worker process crashed"}
+    except Exception as e:
+        return {'error': f"{kind.upper()} parsing failed: {e}"}
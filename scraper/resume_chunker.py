@@ -0,0 +1,145 @@
+"""
+Structure-aware chunking of extracted resume text for embedding
+Chunks follow the resume's sections instead of fixed character windows:
+small adjacent sections share a chunk, a section too large for one chunk is
+split between lines (or sentences), and each continuation chunk repeats the
+section header plus a few lines of overlap. Where chunks start depends only
+on which sections are small, never on running token totals, so editing one
+section leaves the chunks of every other group, and their hashes, unchanged.
+Every chunk carries the SHA-256 of its text, so on re-upload the backend can
+skip re-embedding chunks it has already seen.
+
+Tokens are approximated as words and punctuation marks, which is close to
+what subword tokenizers produce for resume text and needs no model.
+"""
+
+import hashlib
+import re
+
+TOKEN = re.compile(r'\w+|[^\w\s]')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?;])\s+')
+# A section is small when it takes at most 1/GROUP_SIZE of the token budget;
+# up to GROUP_SIZE adjacent small sections share one chunk
+GROUP_SIZE = 4
+
+
+def count_tokens(text: str) -> int:
+    return len(TOKEN.findall(text))
+
+
+def _split_words(text, max_tokens):
+    """Last resort for one huge sentence: cut between words"""
+    part = []
+    tokens = 0
+    for word in text.split():
+        word_tokens = count_tokens(word)
+        if part and tokens + word_tokens > max_tokens:
+            yield ' '.join(part)
+            part, tokens = [], 0
+        part.append(word)
+        tokens += word_tokens
+    if part:
+        yield ' '.join(part)
+
+
+def _units(lines, max_tokens):
+    """(text, tokens) for each line, with lines over max_tokens split into sentences or word runs"""
+    for line in lines:
+        # Keep indentation: nested bullets stay nested
+        line = line.rstrip()
+        if not line.strip():
+            continue
+        tokens = count_tokens(line)
+        if tokens <= max_tokens:
+            yield line, tokens
+            continue
+        for sentence in SENTENCE_BREAK.split(line):
+            sentence_tokens = count_tokens(sentence)
+            if sentence_tokens <= max_tokens:
+                yield sentence, sentence_tokens
+            else:
+                for words in _split_words(sentence, max_tokens):
+                    yield words, count_tokens(words)
+
+
+def _make_chunk(index, sections, parts, tokens):
+    text = '\n'.join(parts)
+    return {
+        'index': index,
+        'sections': sections,
+        'text': text,
+        'tokens': tokens,
+        'sha256': hashlib.sha256(text.encode('utf-8')).hexdigest()
+    }
+
+
+def chunk_sections(sections: list[tuple[str | None, list[str]]], max_tokens: int = 256, overlap_tokens: int = 32) -> list[dict]:
+    """
+    Token-budgeted chunks from (header, lines) sections in document order
+
+    Args:
+        sections: header line (None for text before the first header) and its lines
+        max_tokens: budget per chunk, header included
+        overlap_tokens: trailing lines repeated at the start of a section's next chunk
+
+    Returns:
+        [{'index', 'sections', 'text', 'tokens', 'sha256'}]
+    """
+    small_tokens = max_tokens // GROUP_SIZE
+    chunks = []
+    group = None  # {'sections', 'parts', 'tokens', 'count'} of adjacent small sections
+
+    def flush():
+        nonlocal group
+        if group:
+            chunks.append(_make_chunk(len(chunks), group['sections'], group['parts'], group['tokens']))
+        group = None
+
+    for header, lines in sections:
+        header_tokens = count_tokens(header) if header else 0
+        # A header that leaves no room for content is treated as plain text
+        if header_tokens > max_tokens // 2:
+            lines = [header, *lines]
+            header, header_tokens = None, 0
+        units = list(_units(lines, max_tokens - header_tokens))
+        if not units and not header:
+            continue
+        head = [header] if header else []
+        names = [header] if header else []
+        total = header_tokens + sum(tokens for _, tokens in units)
+
+        # Groups are cut by section count, not by tokens, so GROUP_SIZE small
+        # sections always fit and an edit that keeps its section small moves no boundary
+        if total <= small_tokens:
+            if group and group['count'] == GROUP_SIZE:
+                flush()
+            if not group:
+                group = {'sections': [], 'parts': [], 'tokens': 0, 'count': 0}
+            group['sections'].extend(names)
+            group['parts'].extend(head + [text for text, _ in units])
+            group['tokens'] += total
+            group['count'] += 1
+            continue
+        flush()
+
+        # Split between units; continuation chunks repeat the header and some overlap
+        body = []
+        body_tokens = 0
+        for text, tokens in units:
+            if body and header_tokens + body_tokens + tokens > max_tokens:
+                chunks.append(_make_chunk(len(chunks), list(names), head + [t for t, _ in body], header_tokens + body_tokens))
+                overlap = []
+                overlap_total = 0
+                for unit in reversed(body[1:]):
+                    if overlap_total + unit[1] > overlap_tokens:
+                        break
+                    overlap.insert(0, unit)
+                    overlap_total += unit[1]
+                while overlap and header_tokens + overlap_total + tokens > max_tokens:
+                    overlap_total -= overlap.pop(0)[1]
+                body, body_tokens = overlap, overlap_total
+            body.append((text, tokens))
+            body_tokens += tokens
+        chunks.append(_make_chunk(len(chunks), list(names), head + [t for t, _ in body], header_tokens + body_tokens))
+    flush()
+    return chunks
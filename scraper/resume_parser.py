@@ -0,0 +1,179 @@
+"""
+Resume document parsing for worker processes
+Everything here is CPU-bound and picklable, so the service can run it in a
+process pool and keep the event loop free. Limits are checked inside the
+parse loops. When a document runs past its deadline, page limit or character
+limit, the text read so far comes back with truncated=True and the reason.
+"""
+
+import io
+import re
+import time
+import zipfile
+
+# Bump whenever extracted text or skills/projects change for the same file
+# (part of the /extract/resume cache key)
+PARSER_VERSION = 4
+
+
+def join_pages(pages) -> str:
+    """Page texts in order, one trailing newline each, skipping empty pages (single join, no +=)"""
+    return ''.join([f"{page}\n" for page in pages if page])
+
+
+def _result(text, pages, max_chars, reason=None):
+    if len(text) > max_chars:
+        text = text[:max_chars]
+        reason = reason or 'size_limit'
+    return {
+        'text': text,
+        'pages': pages,
+        'truncated': reason is not None,
+        'truncated_reason': reason
+    }
+
+
+def parse_pdf_pages(content: bytes, start: int, stop: int, deadline: float, max_chars: int) -> dict:
+    """
+    Extract pages [start, stop) from a PDF held in memory
+    Each call opens its own reader over the buffer, so ranges of one document
+    can be extracted by several workers at once.
+
+    Returns:
+        dict with start, pages (texts in order), total_pages and truncated_reason
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(content))
+    total_pages = len(reader.pages)
+    pages = []
+    chars = 0
+    reason = None
+    for index in range(start, min(stop, total_pages)):
+        if time.time() > deadline:
+            reason = 'timeout'
+            break
+        page_text = reader.pages[index].extract_text() or ''
+        pages.append(page_text)
+        chars += len(page_text) + 1
+        if chars > max_chars:
+            reason = 'size_limit'
+            break
+    return {'start': start, 'pages': pages, 'total_pages': total_pages, 'truncated_reason': reason}
+
+
+def parse_pdf(content: bytes, deadline: float, max_pages: int, max_chars: int) -> dict:
+    """Whole PDF in one worker (see parse_pool.iter_pdf_pages for the page-parallel path)"""
+    chunk = parse_pdf_pages(content, 0, max_pages, deadline, max_chars)
+    reason = chunk['truncated_reason']
+    if reason is None and chunk['total_pages'] > max_pages:
+        reason = 'page_limit'
+    return _result(join_pages(chunk['pages']), chunk['total_pages'], max_chars, reason)
+
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = f"{W_NS}p"
+W_TEXT_TAGS = {f"{W_NS}t": None, f"{W_NS}tab": '\t', f"{W_NS}br": '\n', f"{W_NS}cr": '\n'}
+# Legacy VML copy of a text box that Word also writes in the modern form
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+DOCX_PARTS = re.compile(r'word/(header\d*|document|footer\d*)\.xml')
+
+
+def docx_parts(names) -> list[str]:
+    """Text-bearing parts of a DOCX archive in reading order: headers, body, footers"""
+    order = {'header': 0, 'document': 1, 'footer': 2}
+    parts = [name for name in names if DOCX_PARTS.fullmatch(name)]
+    return sorted(parts, key=lambda name: (order[re.sub(r'\d', '', name[5:-4])], len(name), name))
+
+
+def _paragraph_text(paragraph) -> str:
+    pieces = []
+    for node in paragraph.iter(*W_TEXT_TAGS):
+        text = W_TEXT_TAGS[node.tag]
+        pieces.append((node.text or '') if text is None else text)
+    return ''.join(pieces)
+
+
+def iter_docx_paragraphs(source):
+    """
+    Text of every paragraph in one WordprocessingML part, in document order
+    Table cells and text boxes are paragraphs too. Each paragraph is removed
+    from the tree once read, so memory stays flat however long the part is.
+    """
+    from lxml import etree
+
+    fallback_depth = 0
+    for event, elem in etree.iterparse(source, events=('start', 'end'), tag=(W_P, MC_FALLBACK), huge_tree=True):
+        if elem.tag == MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        if event == 'start':
+            continue
+        if not fallback_depth:
+            # A text box's own paragraphs were read (and cleared) before the paragraph holding it
+            yield _paragraph_text(elem)
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def parse_docx(content: bytes, deadline: float, max_chars: int) -> dict:
+    """
+    Stream paragraphs straight from the DOCX XML (no python-docx object model):
+    headers, then body text including tables and text boxes, then footers.
+    Lines repeated across header/footer parts are kept once.
+    """
+    parts = []
+    chars = 0
+    reason = None
+    seen_edges = set()
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for name in docx_parts(archive.namelist()):
+            is_body = name == 'word/document.xml'
+            with archive.open(name) as source:
+                for text in iter_docx_paragraphs(source):
+                    if time.time() > deadline:
+                        reason = 'timeout'
+                        break
+                    if not text.strip():
+                        continue
+                    if not is_body:
+                        if text in seen_edges:
+                            continue
+                        seen_edges.add(text)
+                    parts.append(text)
+                    chars += len(text) + 1
+                    if chars > max_chars:
+                        break
+            if reason or chars > max_chars:
+                break
+    return _result('\n'.join(parts), None, max_chars, reason)
+
+
+def parse_text(content: bytes, max_chars: int) -> dict:
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        text = content.decode('latin-1')
+    return _result(text, None, max_chars)
+
+
+def parse_document(kind: str, content: bytes, deadline: float, max_pages: int, max_chars: int) -> dict:
+    """
+    Extract text from a 'pdf', 'docx' or 'txt' document
+    deadline is a wall-clock time.time() value, so time spent waiting for a
+    worker counts against it.
+
+    Returns:
+        dict with text, pages, truncated and truncated_reason, or error
+    """
+    try:
+        if kind == 'pdf':
+            return parse_pdf(content, deadline, max_pages, max_chars)
+        if kind == 'docx':
+            return parse_docx(content, deadline, max_chars)
+        return parse_text(content, max_chars)
+    except Exception as e:
+        return {'error': f"{kind.upper()} parsing failed: {e}"}
@@ -0,0 +1,171 @@
+"""
+Skill gazetteer matcher
+Loads canonical skill names and their aliases from a data file (see
+data/skills.txt) and compiles them once into a single trie-shaped regular
+expression. Aliases that share a prefix share one branch, so a scan is one
+left-to-right pass over the text whatever the gazetteer size, and the
+longest alias wins ("React Native" over "React", "Node.js" over "Node").
+Names that are everyday words at the start of a sentence ("Go", "Swift",
+"C", "Spring") only count in technical context.
+"""
+
+import logging
+import os
+import re
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKILLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.txt')
+
+# A skill must not be glued to other name characters ("Java" in "JavaScript",
+# "js" in "Node.js", "C" in "C++"); trailing "-" is allowed for "Python-based"
+_BEFORE = r'(?<![\w+#.&])'
+_AFTER = r'(?![\w+#&])'
+
+# Technical context for "~" names: what may separate list neighbours
+# ("Python, Go and Rust"), words that follow a technology ("Go developer",
+# "Swift 5"), phrases that introduce one ("written in C"), and a bullet or
+# "Label:" prefix before a name standing alone on its line
+_LIST_GAP = re.compile(r'(?:[\s,;/|&()+*•-]|\b(?:and|or)\b)*', re.IGNORECASE)
+_CUE_AFTER = re.compile(
+    r'\s*(?:\d|(?:language|lang|developers?|engineers?|programming|programmers?|framework|code|'
+    r'codebase|sdks?|apis?|services|microservices|modules?|apps|applications|backend|stack|ecosystem)\b)',
+    re.IGNORECASE
+)
+_CUE_BEFORE = re.compile(
+    r'(?:(?:written|coded|programming|programmed|developed|developing|proficient|proficiency|fluent|'
+    r'expertise|experience|experienced|skilled|knowledge)\s+(?:in|with|of)|using)\s+$',
+    re.IGNORECASE
+)
+_LINE_PREFIX = re.compile(r'\s*(?:[-*•]\s*)?(?:[^\n:]{1,40}:\s*)?$')
+_LINE_REST = re.compile(r'\s*[.;,]?\s*(?:\n|$)')
+
+
+def load_gazetteer(path: str) -> list[tuple[str, list[tuple[str, bool]]]]:
+    """
+    Parse a gazetteer file into (canonical, [(alias, case_sensitive, needs_context), ...])
+    Line format: "Canonical | alias | alias"; "=" before a name makes it
+    case-sensitive, "~" case-sensitive and dependent on technical context.
+    """
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            names = []
+            for name in line.split('|'):
+                name = name.strip()
+                needs_context = name.startswith('~')
+                case_sensitive = needs_context or name.startswith('=')
+                name = ' '.join(name.lstrip('=~').split())
+                if name:
+                    names.append((name, case_sensitive, needs_context))
+            if names:
+                entries.append((names[0][0], names))
+    return entries
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a character trie; '' marks the end of an alias"""
+    branches = []
+    for char, child in sorted(node.items()):
+        if not char:
+            continue
+        # Any run of whitespace matches the single space in an alias
+        token = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(token + _trie_pattern(child))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # Greedy optional: try the longer aliases first, fall back to ending here
+    return f"(?:{body})?" if '' in node else body
+
+
+def _build_trie(aliases) -> dict:
+    root = {}
+    for alias in aliases:
+        node = root
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return root
+
+
+class SkillMatcher:
+    """Finds gazetteer skills in free text and returns their canonical names"""
+
+    def __init__(self, entries):
+        self._exact = {}  # case-sensitive alias -> canonical
+        self._folded = {}  # lowercased alias -> canonical
+        self._needs_context = set()  # case-sensitive aliases that are everyday words
+        for canonical, names in entries:
+            for alias, case_sensitive, needs_context in names:
+                table, key = (self._exact, alias) if case_sensitive else (self._folded, alias.lower())
+                if key in table and table[key] != canonical:
+                    logger.debug("[SKILLS] Alias '%s' already maps to %s, ignoring for %s", alias, table[key], canonical)
+                    continue
+                table[key] = canonical
+                if needs_context:
+                    self._needs_context.add(alias)
+        self.skill_count = len(entries)
+        self.alias_count = len(self._exact) + len(self._folded)
+
+        alternatives = []
+        if self._folded:
+            alternatives.append(f"(?P<folded>(?i:{_trie_pattern(_build_trie(self._folded))}))")
+        if self._exact:
+            alternatives.append(f"(?P<exact>{_trie_pattern(_build_trie(self._exact))})")
+        self._pattern = re.compile(f"{_BEFORE}(?:{'|'.join(alternatives) or '(?!)'}){_AFTER}")
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillMatcher':
+        return cls(load_gazetteer(path))
+
+    def finditer(self, text: str):
+        """Yield (canonical, start, end) for every skill mention in order"""
+        mentions = []  # (canonical, start, end, needs_context)
+        for match in self._pattern.finditer(text):
+            alias = ' '.join(match.group().split())
+            if match.lastgroup == 'exact':
+                # One-letter languages: "C-level" and "R&D" are not skills
+                if len(alias) == 1 and text[match.end():match.end() + 1] == '-':
+                    continue
+                mentions.append((self._exact[alias], match.start(), match.end(), alias in self._needs_context))
+            else:
+                mentions.append((self._folded[alias.lower()], match.start(), match.end(), False))
+
+        for i, (canonical, start, end, needs_context) in enumerate(mentions):
+            if needs_context and not self._in_context(text, mentions, i):
+                continue
+            yield canonical, start, end
+
+    @staticmethod
+    def _in_context(text: str, mentions: list, i: int) -> bool:
+        """Whether an everyday-word mention reads as a technology (see _LIST_GAP and the cues)"""
+        _, start, end, _ = mentions[i]
+        if i > 0 and _LIST_GAP.fullmatch(text, mentions[i - 1][2], start):
+            return True
+        if i + 1 < len(mentions) and _LIST_GAP.fullmatch(text, end, mentions[i + 1][1]):
+            return True
+        if _CUE_AFTER.match(text, end) or _CUE_BEFORE.search(text, max(0, start - 40), start):
+            return True
+        line_start = text.rfind('\n', 0, start) + 1
+        return bool(_LINE_PREFIX.fullmatch(text, line_start, start) and _LINE_REST.match(text, end))
+
+    def find(self, text: str) -> list[str]:
+        """Canonical skills mentioned in text, deduplicated, in order of first mention"""
+        seen = {}
+        for canonical, _, _ in self.finditer(text):
+            seen.setdefault(canonical, None)
+        return list(seen)
+
+
+@lru_cache(maxsize=None)
+def get_matcher() -> SkillMatcher:
+    """Shared matcher, compiled on first use from SKILLS_FILE (default data/skills.txt)"""
+    path = os.environ.get('SKILLS_FILE') or DEFAULT_SKILLS_FILE
+    matcher = SkillMatcher.from_file(path)
+    logger.info("[SKILLS] Loaded %d skills (%d aliases) from %s", matcher.skill_count, matcher.alias_count, path)
+    return matcher
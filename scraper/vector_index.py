@@ -0,0 +1,534 @@
+"""
+Memory-mapped vector index for top-k chunk retrieval
+Normalized float32 embeddings live in one memory-mapped matrix on disk, so
+the index survives restarts and the OS pages vectors in as they are needed.
+A query is one matrix-vector product plus argpartition instead of a full
+scan in the backend. Appends grow the files and deletes only clear the row's
+alive flag; once deleted rows pass VECTOR_COMPACT_DEAD of the index,
+compact() rewrites the live rows so queries stop scanning dead ones.
+
+- Queries score outside the lock; files are only grown once no query holds
+  a view of them (Windows cannot extend a file that is mapped)
+- Per-user row lists, so a user's query only touches that user's chunks
+- Optional IVF mode for large corpora: spherical k-means centroids split the
+  rows into lists, and a query scores only the rows in the nearest lists
+  (build_ivf(); rows appended later join their nearest list)
+
+Files in the index directory:
+    meta.json      dim, count and IVF list count
+    vectors.f32    count x dim normalized embeddings
+    users.i32      user code per row (-1: none), names in users.txt
+    alive.u1       1 for live rows, 0 for deleted ones
+    keys.txt       external chunk id per row, one per line
+    ivf.f32        IVF centroids, ivf_lists.i32 list per row
+    compact.json   meta of a compaction whose *.compact files are complete
+                   (swapped in on the next open if it was interrupted)
+
+Settings (environment variables):
+- VECTOR_INDEX_DIR: index directory (default: <temp>/interviewly-vector-index)
+- VECTOR_IVF_PROBES: IVF lists scanned per approximate query (default 8)
+- VECTOR_COMPACT_DEAD: fraction of deleted rows that triggers compaction (default 0.3)
+"""
+
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from embedder import EMBED_DIM
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.environ.get('VECTOR_INDEX_DIR') or os.path.join(tempfile.gettempdir(), 'interviewly-vector-index')
+IVF_PROBES = int(os.environ.get('VECTOR_IVF_PROBES', '8'))
+COMPACT_DEAD_FRACTION = float(os.environ.get('VECTOR_COMPACT_DEAD', '0.3'))
+# Fewer deleted rows than this are not worth rewriting the files for
+COMPACT_MIN_DEAD = 1024
+INITIAL_CAPACITY = 1024
+# Rows handled per block when assigning IVF lists or compacting, to bound temporary memory
+ASSIGN_BLOCK = 65536
+# Per-row files rewritten by compaction
+COMPACTED_FILES = ('vectors.f32', 'users.i32', 'alive.u1', 'ivf_lists.i32', 'keys.txt', 'users.txt')
+
+
+class _Column:
+    """A growable memory-mapped array of `capacity` rows"""
+
+    def __init__(self, path: str, dtype, width: int = 1, fill=0):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.fill = fill
+        self.data = None
+        row_bytes = self.dtype.itemsize * width
+        existing = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+        self._open(max(existing, INITIAL_CAPACITY))
+
+    def _open(self, capacity):
+        row_bytes = self.dtype.itemsize * self.width
+        old_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        with open(self.path, 'ab') as f:
+            if old_size < capacity * row_bytes:
+                f.truncate(capacity * row_bytes)
+        shape = (capacity, self.width) if self.width > 1 else (capacity,)
+        self.data = np.memmap(self.path, dtype=self.dtype, mode='r+', shape=shape)
+        if self.fill and old_size < capacity * row_bytes:
+            self.data[old_size // row_bytes:] = self.fill
+        self.capacity = capacity
+
+    def reserve(self, rows: int):
+        """Make room for `rows` rows, doubling so appends stay amortized O(1)"""
+        if rows <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < rows:
+            capacity *= 2
+        self.data.flush()
+        self.data = None
+        self._open(capacity)
+
+    def flush(self):
+        self.data.flush()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (argpartition, then sort only those k)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class VectorIndex:
+    """Append/delete/search over a memory-mapped embedding matrix (thread-safe)"""
+
+    def __init__(self, directory: str, dim: int = EMBED_DIM):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        # Searches scoring a view of the memory maps outside the lock. Growing
+        # a mapped file fails on Windows while a view is open, so growth waits
+        # for them to finish, and new searches wait behind a waiting writer.
+        self._readers = 0
+        self._writers_waiting = 0
+        self._readers_changed = threading.Condition(self._lock)
+
+        self._finish_compaction()
+        meta = self._read_meta()
+        self.dim = meta.get('dim', dim)
+        if self.dim != dim:
+            raise ValueError(f"Index in {directory} holds {self.dim}-dim vectors, not {dim}")
+        self._load(meta)
+        logger.info("[VECTOR INDEX] Opened %s: %d rows, %d live", directory, self.count, len(self._rows_by_key))
+
+    def _load(self, meta: dict):
+        """Open the column files and rebuild the in-memory row indexes"""
+        self.count = meta.get('count', 0)
+
+        self._vectors = _Column(self._path('vectors.f32'), np.float32, self.dim)
+        self._users = _Column(self._path('users.i32'), np.int32, fill=-1)
+        self._alive = _Column(self._path('alive.u1'), np.uint8)
+        self._keys = self._read_lines('keys.txt')
+        if len(self._keys) != self.count:
+            # An append was interrupted: keep only rows that have both a key and a count
+            self.count = min(self.count, len(self._keys))
+            self._keys = self._keys[:self.count]
+            self._rewrite_lines('keys.txt', self._keys)
+        self._user_names = self._read_lines('users.txt')
+        self._user_codes = {name: code for code, name in enumerate(self._user_names)}
+
+        self._rows_by_key = {}
+        alive = self._alive.data[:self.count]
+        for row in np.flatnonzero(alive):
+            self._rows_by_key[self._keys[row]] = int(row)
+        self._user_rows = self._group_rows(self._users.data[:self.count], len(self._user_names))
+        self._user_arrays = {}
+
+        self._centroids = None
+        self._lists = None
+        self._list_rows = None
+        self._list_arrays = {}
+        if meta.get('ivf_lists'):
+            self._centroids = np.fromfile(self._path('ivf.f32'), dtype=np.float32).reshape(-1, self.dim)
+            self._lists = _Column(self._path('ivf_lists.i32'), np.int32, fill=-1)
+            self._list_rows = self._group_rows(self._lists.data[:self.count], len(self._centroids))
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_meta(self) -> dict:
+        try:
+            with open(self._path('meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_meta(self, name: str = 'meta.json', count: int | None = None):
+        meta = {
+            'dim': self.dim,
+            'count': self.count if count is None else count,
+            'ivf_lists': len(self._centroids) if self._centroids is not None else 0
+        }
+        tmp_path = self._path(f"{name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(name))
+
+    def _read_lines(self, name) -> list[str]:
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f:
+                return f.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def _rewrite_lines(self, name, lines):
+        tmp_path = self._path(f"{name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{line}\n" for line in lines)
+        os.replace(tmp_path, self._path(name))
+
+    def _append_lines(self, name, lines):
+        with open(self._path(name), 'a', encoding='utf-8') as f:
+            f.writelines(f"{line}\n" for line in lines)
+
+    @staticmethod
+    def _group_rows(codes: np.ndarray, groups: int) -> list[list[int]]:
+        """Row numbers per code (negative codes skipped), in row order"""
+        rows = [[] for _ in range(groups)]
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        bounds = np.searchsorted(sorted_codes, np.arange(groups + 1))
+        for code in range(groups):
+            rows[code] = order[bounds[code]:bounds[code + 1]].tolist()
+        return rows
+
+    def _wait_for_readers(self):
+        """Block (holding the lock between checks) until no search holds a view"""
+        self._writers_waiting += 1
+        try:
+            while self._readers:
+                self._readers_changed.wait()
+        finally:
+            self._writers_waiting -= 1
+            self._readers_changed.notify_all()
+
+    def _user_code(self, user_id):
+        if user_id is None:
+            return -1
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = len(self._user_names)
+            self._user_names.append(user_id)
+            self._user_codes[user_id] = code
+            self._user_rows.append([])
+            self._append_lines('users.txt', [user_id])
+        return code
+
+    def add(self, keys: list[str], vectors, user_id: str | None = None) -> int:
+        """
+        Append vectors under the given chunk ids; an id already in the index
+        is replaced (its old row is deleted)
+
+        Returns:
+            number of rows added
+        """
+        vectors = _normalize(vectors)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors")
+        if len(keys) != len(vectors):
+            raise ValueError("One id is needed per vector")
+        # Ids and user ids are stored one per line
+        if any(key.splitlines() != [key] for key in keys) or (user_id is not None and user_id.splitlines() != [user_id]):
+            raise ValueError("Ids must be non-empty single-line strings")
+        if len(set(keys)) != len(keys):
+            raise ValueError("Duplicate ids in one add")
+
+        with self._lock:
+            self._delete_rows([self._rows_by_key[key] for key in keys if key in self._rows_by_key])
+            start, stop = self.count, self.count + len(keys)
+            code = self._user_code(user_id)
+            if any(stop > column.capacity for column in self._columns()):
+                self._wait_for_readers()
+            for column in self._columns():
+                column.reserve(stop)
+            self._vectors.data[start:stop] = vectors
+            self._users.data[start:stop] = code
+            self._alive.data[start:stop] = 1
+            if self._centroids is not None:
+                lists = np.argmax(vectors @ self._centroids.T, axis=1)
+                self._lists.data[start:stop] = lists
+                for row, list_no in zip(range(start, stop), lists.tolist()):
+                    self._list_rows[list_no].append(row)
+                    self._list_arrays.pop(list_no, None)
+            for column in self._columns():
+                column.flush()
+            # Keys go last: a row only counts once its key is on disk
+            self._append_lines('keys.txt', keys)
+            self._keys.extend(keys)
+            self.count = stop
+            self._write_meta()
+
+            for row, key in zip(range(start, stop), keys):
+                self._rows_by_key[key] = row
+            if code >= 0:
+                self._user_rows[code].extend(range(start, stop))
+                self._user_arrays.pop(code, None)
+            self._maybe_compact()
+        return len(keys)
+
+    def delete(self, keys: list[str] | None = None, user_id: str | None = None) -> int:
+        """Delete rows by chunk id and/or every row of a user; returns rows deleted"""
+        with self._lock:
+            rows = [self._rows_by_key[key] for key in (keys or []) if key in self._rows_by_key]
+            code = self._user_codes.get(user_id) if user_id is not None else None
+            if code is not None:
+                rows.extend(row for row in self._user_rows[code] if self._alive.data[row])
+            deleted = self._delete_rows(rows)
+            self._maybe_compact()
+            return deleted
+
+    def _delete_rows(self, rows) -> int:
+        rows = sorted(set(rows))
+        if not rows:
+            return 0
+        self._alive.data[rows] = 0
+        self._alive.flush()
+        for row in rows:
+            self._rows_by_key.pop(self._keys[row], None)
+        # Deleted rows are dropped from the per-user/IVF arrays when next rebuilt
+        self._user_arrays.clear()
+        self._list_arrays.clear()
+        return len(rows)
+
+    def _maybe_compact(self):
+        """Compact once deleted rows pass COMPACT_DEAD_FRACTION of the index (caller holds the lock)"""
+        dead = self.count - len(self._rows_by_key)
+        if dead >= COMPACT_MIN_DEAD and dead > COMPACT_DEAD_FRACTION * self.count:
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Rewrite the live rows contiguously, dropping deleted rows, their keys
+        and users left without rows. Searches are held off while it runs.
+        New files are written as *.compact next to the old ones and swapped in
+        after compact.json marks them complete, so an interrupted compaction
+        either finishes on the next open or leaves the old files in place.
+
+        Returns:
+            number of rows removed
+        """
+        with self._lock:
+            live = np.flatnonzero(self._alive.data[:self.count])
+            removed = self.count - len(live)
+            if not removed:
+                return 0
+            self._wait_for_readers()
+
+            codes = np.asarray(self._users.data[:self.count][live])
+            kept_users = np.unique(codes[codes >= 0])
+            # Old code -> new code; index -1 (no user) reads the trailing -1
+            new_codes = np.full(len(self._user_names) + 1, -1, dtype=np.int32)
+            new_codes[kept_users] = np.arange(len(kept_users), dtype=np.int32)
+            new_codes[codes].tofile(self._path('users.i32.compact'))
+            np.ones(len(live), dtype=np.uint8).tofile(self._path('alive.u1.compact'))
+            self._write_rows('vectors.f32.compact', self._vectors, live)
+            if self._lists is not None:
+                self._write_rows('ivf_lists.i32.compact', self._lists, live)
+            self._rewrite_lines('keys.txt.compact', [self._keys[row] for row in live.tolist()])
+            self._rewrite_lines('users.txt.compact', [self._user_names[code] for code in kept_users.tolist()])
+            self._write_meta('compact.json', len(live))
+
+            # Files cannot be replaced while mapped on Windows
+            for column in self._columns():
+                column.data = None
+            self._finish_compaction()
+            self._load(self._read_meta())
+            logger.info("[VECTOR INDEX] Compacted %s: removed %d dead rows, %d live", self.directory, removed, self.count)
+            return removed
+
+    def _write_rows(self, name, column, rows):
+        """Write column rows in order to a new file, a block at a time"""
+        with open(self._path(name), 'wb') as f:
+            for start in range(0, len(rows), ASSIGN_BLOCK):
+                np.asarray(column.data[rows[start:start + ASSIGN_BLOCK]]).tofile(f)
+
+    def _finish_compaction(self):
+        """Swap in the files of a compaction that got as far as compact.json; drop those of one that did not"""
+        marker = self._path('compact.json')
+        complete = os.path.exists(marker)
+        for name in COMPACTED_FILES:
+            path = self._path(f"{name}.compact")
+            if not os.path.exists(path):
+                continue
+            if complete:
+                os.replace(path, self._path(name))
+            else:
+                os.remove(path)
+        if complete:
+            os.replace(marker, self._path('meta.json'))
+
+    def _columns(self):
+        columns = [self._vectors, self._users, self._alive]
+        if self._lists is not None:
+            columns.append(self._lists)
+        return columns
+
+    def build_ivf(self, n_lists: int | None = None, iterations: int = 10, sample_size: int = 100000, seed: int = 0) -> int:
+        """
+        Cluster the live rows into n_lists lists (default sqrt of the live
+        count) with spherical k-means on a sample, then assign every row
+
+        Returns:
+            number of lists
+        """
+        with self._lock:
+            live = np.flatnonzero(self._alive.data[:self.count])
+            if len(live) == 0:
+                raise ValueError("Index is empty")
+            n_lists = max(1, min(n_lists or int(math.sqrt(len(live))), len(live)))
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(rng.choice(live, size=min(sample_size, len(live)), replace=False))
+            sample = np.asarray(self._vectors.data[sample_rows])
+
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                assignment = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample)
+                counts = np.bincount(assignment, minlength=n_lists)
+                empty = counts == 0
+                # Re-seed empty lists with random sample rows
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+                centroids = _normalize(sums)
+
+            self._centroids = centroids.astype(np.float32)
+            self._centroids.tofile(self._path('ivf.f32'))
+            if self._lists is not None:
+                # Drop the old map before the file is reopened and grown
+                self._lists.data = None
+            self._lists = _Column(self._path('ivf_lists.i32'), np.int32, fill=-1)
+            self._lists.reserve(self._vectors.capacity)
+            for start in range(0, self.count, ASSIGN_BLOCK):
+                stop = min(start + ASSIGN_BLOCK, self.count)
+                self._lists.data[start:stop] = np.argmax(self._vectors.data[start:stop] @ self._centroids.T, axis=1)
+            self._lists.flush()
+            self._list_rows = self._group_rows(self._lists.data[:self.count], n_lists)
+            self._list_arrays = {}
+            self._write_meta()
+            logger.info("[VECTOR INDEX] Built IVF with %d lists over %d rows", n_lists, self.count)
+            return n_lists
+
+    def _live_rows(self, cache: dict, groups: list[list[int]], number: int) -> np.ndarray:
+        rows = cache.get(number)
+        if rows is None:
+            rows = np.asarray(groups[number], dtype=np.int64)
+            rows = rows[self._alive.data[rows].astype(bool)]
+            cache[number] = rows
+        return rows
+
+    def search(self, query, k: int = 5, user_id: str | None = None, approximate: bool = False, probes: int = IVF_PROBES) -> list[dict]:
+        """
+        Top-k live rows by cosine similarity to query
+
+        Args:
+            user_id: only this user's chunks (always exact: a user's rows are few)
+            approximate: scan only the `probes` nearest IVF lists (exact if no IVF was built)
+
+        Returns:
+            [{'id', 'score', 'user_id'}] best first
+        """
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+        if query.shape[0] != self.dim:
+            raise ValueError(f"Expected a {self.dim}-dim query")
+
+        with self._lock:
+            while self._writers_waiting:
+                self._readers_changed.wait()
+            # Rows below count never change (deletes only clear alive), so the
+            # scan can run on this view while adds and deletes carry on; files
+            # are only grown once no search holds a view (see _wait_for_readers)
+            count = self.count
+            vectors = self._vectors.data[:count]
+            if user_id is not None:
+                code = self._user_codes.get(user_id)
+                if code is None:
+                    return []
+                rows = self._live_rows(self._user_arrays, self._user_rows, code)
+            elif approximate and self._centroids is not None:
+                nearest = _top_k(self._centroids @ query, probes)
+                rows = np.concatenate([self._live_rows(self._list_arrays, self._list_rows, int(n)) for n in nearest])
+            else:
+                rows = None
+                alive = np.array(self._alive.data[:count], dtype=bool)
+            self._readers += 1
+
+        try:
+            # The expensive part, outside the lock: NumPy releases the GIL for the
+            # matrix-vector product, so concurrent queries run in parallel
+            if rows is None:
+                scores = vectors @ query
+                scores[~alive] = -np.inf
+                top = _top_k(scores, k)
+                top = top[np.isfinite(scores[top])]
+                top_rows, top_scores = top, scores[top]
+            else:
+                scores = vectors[rows] @ query
+                top = _top_k(scores, k)
+                top_rows, top_scores = rows[top], scores[top]
+        finally:
+            del vectors
+            with self._lock:
+                self._readers -= 1
+                if not self._readers:
+                    self._readers_changed.notify_all()
+
+        with self._lock:
+            return [
+                {
+                    'id': self._keys[row],
+                    'score': float(score),
+                    'user_id': self._user_names[code] if code >= 0 else None
+                }
+                for row, score, code in zip(top_rows.tolist(), top_scores.tolist(), self._users.data[top_rows].tolist())
+            ]
+
+    def stats(self) -> dict:
+        """Counters for /health"""
+        with self._lock:
+            return {
+                'dim': self.dim,
+                'rows': self.count,
+                'live': len(self._rows_by_key),
+                'users': len(self._user_names),
+                'ivf_lists': len(self._centroids) if self._centroids is not None else 0
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> VectorIndex:
+    """Shared index in VECTOR_INDEX_DIR, opened on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex(INDEX_DIR)
+        return _index
+
+
+def stats() -> dict:
+    if _index is None:
+        return {'opened': False}
+    return {'opened': True, **_index.stats()}
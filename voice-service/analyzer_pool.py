@@ -0,0 +1,225 @@
+"""
+Process pool of VoiceAnalyzer workers with bounded admission
+Each worker process loads its own Whisper model once, so concurrent
+sessions run in parallel instead of racing on one shared model.
+"""
+
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+
+class PoolFullError(Exception):
+    """Raised when the admission queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__("Voice analysis queue is full")
+        self.retry_after = retry_after
+
+
+class AnalysisTimeoutError(Exception):
+    """Raised when an admitted job does not finish within the caller's timeout"""
+
+    def __init__(self, timeout):
+        super().__init__(f"Voice analysis did not finish within {timeout:g} s")
+        self.timeout = timeout
+
+
+# Per-process analyzer and warm-up outcome, set by the pool initializer
+_worker_analyzer = None
+_worker_warm_up = None
+
+
+def _init_worker(pitch_mode, cpu_threads):
+    global _worker_analyzer, _worker_warm_up
+    from voice_analyzer import VoiceAnalyzer
+    _worker_analyzer = VoiceAnalyzer(pitch_mode=pitch_mode, cpu_threads=cpu_threads)
+    try:
+        _worker_warm_up = {'timings': _worker_analyzer.warm_up(), 'error': None}
+    except Exception as e:
+        print(f"[POOL] Warm-up failed: {e}", file=sys.stderr)
+        _worker_warm_up = {'timings': None, 'error': str(e)}
+
+
+def _worker_status(hold):
+    # Holding the probe briefly keeps one warm worker from answering every probe
+    time.sleep(hold)
+    return {'pid': os.getpid(), **_worker_warm_up}
+
+
+def _analyze_in_worker(audio_source):
+    return _worker_analyzer.analyze(audio_source)
+
+
+class AnalyzerPool:
+    """
+    N analyzer processes behind a bounded admission queue
+
+    At most `workers + max_queue` jobs are admitted at once; beyond that
+    analyze() raises PoolFullError with a Retry-After estimate.
+    """
+
+    def __init__(self, workers=1, cpu_threads=0, max_queue=8, pitch_mode='piptrack'):
+        self.workers = workers
+        self.cpu_threads = cpu_threads
+        self.max_queue = max_queue
+        self.pitch_mode = pitch_mode
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._rejected = 0
+        # Running average of job duration, seeds the Retry-After estimate
+        self._avg_job_seconds = 5.0
+        self.ready = False
+        self.warm_up_error = None
+        self._warm_workers = set()
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        print(f"[POOL] Starting {self.workers} analyzer worker(s), "
+              f"{self.cpu_threads or 'default'} CPU thread(s) each", file=sys.stderr)
+        # Spawn, not fork: this runs on a warm-up thread while waitress threads
+        # are serving, and a forked child would inherit their locks
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.pitch_mode, self.cpu_threads)
+        )
+
+    def warm_up(self, timeout=300):
+        """
+        Block until every worker has loaded its model and run the built-in
+        warm-up clip; sets `ready` once each worker process has answered a
+        probe without error. Each worker warms up in its initializer before
+        taking any job.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            executor = self._executor
+        errors = []
+        while not errors:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                errors.append(f"Only {len(self._warm_workers)} of {self.workers} worker(s) warmed up within {timeout} s")
+                break
+            probes = [executor.submit(_worker_status, 0.05) for _ in range(self.workers)]
+            for probe in probes:
+                try:
+                    status = probe.result(timeout=max(0, deadline - time.monotonic()))
+                except Exception as e:
+                    errors.append(str(e) or type(e).__name__)
+                    continue
+                if status['error']:
+                    errors.append(status['error'])
+                else:
+                    with self._lock:
+                        self._warm_workers.add(status['pid'])
+            with self._lock:
+                if len(self._warm_workers) >= self.workers:
+                    break
+
+        with self._lock:
+            if self._executor is not executor:
+                # The pool was replaced meanwhile; its own warm-up decides readiness
+                return False
+            self.warm_up_error = '; '.join(errors) or None
+            self.ready = not errors
+        return self.ready
+
+    def analyze(self, audio_source, timeout=None):
+        """
+        Run one analysis (file path or audio bytes) on a worker, blocking until it finishes
+        Raises PoolFullError when the queue is full and AnalysisTimeoutError
+        after `timeout` seconds. A timed-out job that is still queued is
+        cancelled; one already running keeps its admission slot until it ends.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PoolFullError(self._retry_after())
+            self._pending += 1
+            executor = self._executor
+
+        start = time.perf_counter()
+        try:
+            future = executor.submit(_analyze_in_worker, audio_source)
+        except BaseException as e:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            if isinstance(e, BrokenProcessPool):
+                self._replace_executor(executor)
+            raise
+        # The slot is released when the job actually ends, not when the caller stops waiting
+        future.add_done_callback(lambda done: self._on_done(done, start))
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timed_out += 1
+            raise AnalysisTimeoutError(timeout) from None
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise
+
+    def _on_done(self, future, start):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is None and future.result().get('success'):
+                self._completed += 1
+                self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * elapsed
+            else:
+                self._failed += 1
+
+    def _replace_executor(self, executor):
+        """A worker died (e.g. out of memory); replace the pool for later requests"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            print("[POOL] Worker crashed, restarting pool", file=sys.stderr)
+            self._executor = self._create_executor()
+            # The new workers are cold until they have been probed again
+            self.ready = False
+            self.warm_up_error = None
+            self._warm_workers.clear()
+        threading.Thread(target=self.warm_up, name='warm-up', daemon=True).start()
+
+    def _retry_after(self):
+        """Seconds until a slot is likely free (caller holds the lock)"""
+        waves = self._pending / max(1, self.workers)
+        return max(1, math.ceil(waves * self._avg_job_seconds))
+
+    def stats(self):
+        """Queue depth and in-flight counts for /health"""
+        with self._lock:
+            in_flight = min(self._pending, self.workers)
+            return {
+                'ready': self.ready,
+                'warm_workers': len(self._warm_workers),
+                'workers': self.workers,
+                'cpu_threads': self.cpu_threads,
+                'in_flight': in_flight,
+                'queue_depth': self._pending - in_flight,
+                'max_queue': self.max_queue,
+                'completed': self._completed,
+                'failed': self._failed,
+                'timed_out': self._timed_out,
+                'rejected': self._rejected,
+                'avg_job_seconds': round(self._avg_job_seconds, 2)
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark for VoiceAnalyzer._analyze_filler_words on long transcripts
+(the overlapping-phrase cases are in filler_words_test.py)
+
+Usage: python benchmark_fillers.py [word_count ...]
+"""
+
+import random
+import re
+import sys
+import time
+
+from voice_analyzer import VoiceAnalyzer
+
+
+FILLER_TOKENS = ['um', 'uh', 'like', 'you know', 'kind of', 'so', 'i mean', 'basically']
+CONTENT_TOKENS = ['I', 'built', 'a', 'service', 'with', 'Python', 'and', 'React', 'that',
+                  'handled', 'requests', 'for', 'our', 'team', 'mankind', 'kindness']
+
+
+def legacy_filler_words(transcript):
+    """The previous multi-pass implementation, kept for comparison"""
+    transcript_lower = transcript.lower()
+    words = transcript_lower.split()
+    filler_count = 0
+    fillers_found = {}
+    for word in words:
+        clean_word = re.sub(r'[^\w\s]', '', word)
+        if clean_word in VoiceAnalyzer.FILLER_WORDS:
+            filler_count += 1
+            fillers_found[clean_word] = fillers_found.get(clean_word, 0) + 1
+    for filler in ['you know', 'i mean', 'sort of', 'kind of', 'you see']:
+        count = transcript_lower.count(filler)
+        if count > 0:
+            filler_count += count
+            fillers_found[filler] = count
+    clean_text = transcript
+    for filler in fillers_found.keys():
+        clean_text = re.sub(r'\b' + re.escape(filler) + r'\b', '', clean_text, flags=re.IGNORECASE)
+    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    return {'filler_count': filler_count, 'fillers_found': fillers_found, 'clean_transcript': clean_text}
+
+
+def make_transcript(word_count, filler_ratio=0.1, seed=0):
+    rng = random.Random(seed)
+    tokens = []
+    for _ in range(word_count):
+        pool = FILLER_TOKENS if rng.random() < filler_ratio else CONTENT_TOKENS
+        tokens.append(rng.choice(pool) + rng.choice(['', '', '', ',', '.']))
+    return ' '.join(tokens)
+
+
+def bench(fn, text, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'words':>8} {'legacy (ms)':>12} {'single-pass (ms)':>17} {'speedup':>8}")
+    for size in sizes:
+        text = make_transcript(size)
+        legacy = bench(legacy_filler_words, text)
+        current = bench(VoiceAnalyzer._analyze_filler_words, text)
+        print(f"{size:>8} {legacy * 1000:>12.2f} {current * 1000:>17.2f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
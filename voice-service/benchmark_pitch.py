@@ -0,0 +1,39 @@
+"""
+Benchmark the pitch trackers used by VoiceAnalyzer._analyze_voice_quality
+Compares "piptrack" and "yin" on synthetic speech-like audio (time + output)
+
+Usage: python benchmark_pitch.py [duration_seconds ...]
+"""
+
+import sys
+import time
+
+from generate_test_audio import synthesize_speech_like
+from voice_analyzer import VoiceAnalyzer
+
+
+def bench(y, sr, mode, repeats=3):
+    """Best-of-N wall time and the resulting pitch_variation"""
+    best = float('inf')
+    value = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = VoiceAnalyzer.estimate_pitch_variation(y, sr, mode)
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def main():
+    durations = [float(d) for d in sys.argv[1:]] or [10, 60, 120]
+    sr = VoiceAnalyzer.SAMPLE_RATE
+
+    print(f"{'audio':>8} {'mode':>9} {'time (s)':>9} {'x realtime':>11} {'pitch_var':>10}")
+    for duration in durations:
+        y = synthesize_speech_like(duration, sr)
+        for mode in VoiceAnalyzer.PITCH_MODES:
+            elapsed, value = bench(y, sr, mode)
+            print(f"{duration:>7.0f}s {mode:>9} {elapsed:>9.3f} {duration / elapsed:>11.1f} {value:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
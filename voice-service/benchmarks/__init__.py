@@ -0,0 +1,9 @@
+"""
+Voice pipeline benchmarks
+- corpus: deterministic synthetic audio (durations, sample rates, containers, density)
+- run: times every VoiceAnalyzer stage and end-to-end, writes JSON for comparison
+
+Run from the voice-service folder:
+    python -m benchmarks.run --quick --output bench.json
+    python -m benchmarks.run --compare before.json after.json
+"""
@@ -0,0 +1,56 @@
+"""
+Deterministic benchmark corpus built on generate_test_audio
+Files are regenerated only when missing, so repeated runs reuse the same bytes.
+"""
+
+import os
+import zlib
+
+from generate_test_audio import synthesize_speech_like, write_audio
+
+DURATIONS = (5, 30, 120, 600)
+QUICK_DURATIONS = (5, 30)
+SAMPLE_RATES = (16000, 44100, 48000)
+# "dense": mostly voiced answer, "sparse": silence-heavy answer
+DENSITIES = {'dense': 0.8, 'sparse': 0.2}
+
+
+def corpus_cases(durations=DURATIONS):
+    """
+    Every (duration, sample rate, container, density) combination
+    WebM/Opus cannot carry 44.1 kHz, so WebM cases use 16 and 48 kHz.
+    """
+    cases = []
+    for duration in durations:
+        for density in DENSITIES:
+            for sample_rate in SAMPLE_RATES:
+                containers = ['wav'] if sample_rate == 44100 else ['wav', 'webm']
+                for container in containers:
+                    cases.append({
+                        'name': f"{density}_{duration}s_{sample_rate // 1000}k.{container}",
+                        'duration': duration,
+                        'sample_rate': sample_rate,
+                        'container': container,
+                        'density': density
+                    })
+    return cases
+
+
+def build_corpus(corpus_dir, cases):
+    """Write any missing case files; returns cases with their 'path' filled in"""
+    os.makedirs(corpus_dir, exist_ok=True)
+    built = []
+    for case in cases:
+        path = os.path.join(corpus_dir, case['name'])
+        if not os.path.exists(path):
+            # Seed from the name so each file is stable across runs and machines
+            seed = zlib.crc32(case['name'].encode('utf-8'))
+            audio = synthesize_speech_like(
+                case['duration'],
+                case['sample_rate'],
+                voiced_ratio=DENSITIES[case['density']],
+                seed=seed
+            )
+            write_audio(path, audio, case['sample_rate'])
+        built.append({**case, 'path': path, 'file_bytes': os.path.getsize(path)})
+    return built
@@ -0,0 +1,217 @@
+"""
+Benchmark VoiceAnalyzer stage by stage and end-to-end
+
+Usage (from voice-service/):
+    python -m benchmarks.run [--quick] [--durations 5 30] [--audio my.webm ...] [--output bench.json]
+    python -m benchmarks.run --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.corpus import DURATIONS, QUICK_DURATIONS, build_corpus, corpus_cases
+
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), 'interviewly-voice-bench')
+
+
+def peak_rss_mb():
+    """Process peak resident set size in MB (None where unsupported, e.g. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024, 1)
+
+
+def reset_peak_rss():
+    """
+    Restart the peak RSS at the current RSS (Linux VmHWM)
+    Returns the current RSS in MB, or None where the peak cannot be reset.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def vm_hwm_mb():
+    """Peak RSS in MB since the last reset_peak_rss()"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(analyzer, case, repeats):
+    """
+    Best-of-N end-to-end time; stage timings come from that best run
+    Peak RSS is measured for this case alone (None where it cannot be reset):
+    ru_maxrss would repeat the largest earlier case for every case after it.
+    """
+    baseline = reset_peak_rss()
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = analyzer.analyze(case['path'])
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+
+    elapsed, result = best
+    peak = vm_hwm_mb() if baseline is not None else None
+    audio_seconds = result.get('audio_seconds') or case['duration'] or 0.0
+    return {
+        **{k: v for k, v in case.items() if k != 'path'},
+        'success': result.get('success', False),
+        'error': result.get('error'),
+        'audio_seconds': audio_seconds,
+        'e2e_seconds': round(elapsed, 4),
+        'throughput': round(audio_seconds / elapsed, 2) if elapsed > 0 else None,
+        'timings': result.get('timings', {}),
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+        'rss_growth_mb': round(peak - baseline, 1) if peak is not None else None
+    }
+
+
+def summarize(results, startup_peak_rss_mb):
+    audio = sum(r['audio_seconds'] for r in results)
+    wall = sum(r['e2e_seconds'] for r in results)
+    stages = {}
+    for r in results:
+        for stage, seconds in r['timings'].items():
+            stages[stage] = round(stages.get(stage, 0.0) + seconds, 4)
+    return {
+        'cases': len(results),
+        'audio_seconds': round(audio, 2),
+        'e2e_seconds': round(wall, 4),
+        'throughput': round(audio / wall, 2) if wall > 0 else None,
+        'stage_seconds': stages,
+        # Resetting VmHWM also lowers ru_maxrss, so the overall peak is the
+        # largest of the startup and per-case peaks
+        'peak_rss_mb': max(
+            [p for p in [startup_peak_rss_mb, peak_rss_mb(), *(r['peak_rss_mb'] for r in results)] if p is not None],
+            default=None
+        )
+    }
+
+
+def print_table(results):
+    print(f"\n{'case':<28} {'e2e (s)':>8} {'audio s/s':>10} {'decode':>8} {'vad':>8} "
+          f"{'transcr.':>8} {'quality':>8} {'rss +MB':>8}")
+    for r in results:
+        t = r['timings']
+        print(f"{r['name']:<28} {r['e2e_seconds']:>8.3f} {r['throughput'] or 0:>10.1f} "
+              f"{t.get('decode', 0):>8.3f} {t.get('vad', 0):>8.3f} {t.get('transcription', 0):>8.3f} "
+              f"{t.get('voice_quality', 0):>8.3f} {r['rss_growth_mb'] or 0:>8.1f}")
+
+
+def compare(before_path, after_path):
+    """Per-case end-to-end deltas between two benchmark JSON files"""
+    with open(before_path, 'r', encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, 'r', encoding='utf-8') as f:
+        after = json.load(f)
+
+    old_cases = {r['name']: r for r in before['cases']}
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    print(f"{'case':<28} {'before (s)':>10} {'after (s)':>10} {'change':>8} {'rss +MB':>15}")
+    for r in after['cases']:
+        old = old_cases.get(r['name'])
+        if not old or not old['e2e_seconds']:
+            continue
+        change = (r['e2e_seconds'] - old['e2e_seconds']) / old['e2e_seconds'] * 100
+        # Files from before per-case RSS was recorded have no rss_growth_mb
+        rss = f"{old.get('rss_growth_mb')} -> {r.get('rss_growth_mb')}"
+        print(f"{r['name']:<28} {old['e2e_seconds']:>10.3f} {r['e2e_seconds']:>10.3f} {change:>+7.1f}% {rss:>15}")
+    print(f"\nThroughput (audio s/s): {before['summary']['throughput']} -> {after['summary']['throughput']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the voice analysis pipeline")
+    parser.add_argument('--quick', action='store_true', help=f"Only durations {QUICK_DURATIONS}")
+    parser.add_argument('--durations', type=float, nargs='+', help=f"Override durations (default {DURATIONS})")
+    parser.add_argument('--audio', nargs='+', default=[], help="Extra real recordings to include")
+    parser.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR)
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--pitch-mode', default='piptrack')
+    parser.add_argument('--output', help="Write results as JSON")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    durations = args.durations or (QUICK_DURATIONS if args.quick else DURATIONS)
+    print(f"Building corpus in {args.corpus_dir}...", file=sys.stderr)
+    cases = build_corpus(args.corpus_dir, corpus_cases(durations))
+    for path in args.audio:
+        cases.append({
+            'name': os.path.basename(path), 'duration': None, 'sample_rate': None,
+            'container': os.path.splitext(path)[1].lstrip('.'), 'density': 'recorded',
+            'path': path, 'file_bytes': os.path.getsize(path)
+        })
+
+    from voice_analyzer import VoiceAnalyzer
+
+    start = time.perf_counter()
+    analyzer = VoiceAnalyzer(pitch_mode=args.pitch_mode)
+    model_load_seconds = time.perf_counter() - start
+    startup_peak_rss_mb = peak_rss_mb()
+
+    results = []
+    for case in cases:
+        print(f"Running {case['name']}...", file=sys.stderr)
+        results.append(run_case(analyzer, case, args.repeats))
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'config': analyzer.config(),
+            'repeats': args.repeats,
+            'model_load_seconds': round(model_load_seconds, 3)
+        },
+        'cases': results,
+        'summary': summarize(results, startup_peak_rss_mb)
+    }
+
+    print_table(results)
+    summary = report['summary']
+    print(f"\nTotal: {summary['audio_seconds']}s audio in {summary['e2e_seconds']}s "
+          f"({summary['throughput']} audio s/s), peak RSS {summary['peak_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Filler phrases that overlap single-word fillers or other words must be
+counted once, at the right positions, and removed from the clean transcript
+
+Usage: python filler_words_test.py   (or pytest filler_words_test.py)
+"""
+
+from voice_analyzer import VoiceAnalyzer
+
+# (transcript, expected fillers_found, expected clean_transcript)
+OVERLAP_CASES = [
+    ("I kind of like it", {'kind of': 1, 'like': 1}, "I it"),
+    ("so I mean, you know, it works", {'so': 1, 'i mean': 1, 'you know': 1}, ", , it works"),
+    ("mankind offers kindness", {}, "mankind offers kindness"),
+    ("Kind  of\nsort of", {'kind of': 1, 'sort of': 1}, ""),
+    ("you see, I see you", {'you see': 1}, ", I see you"),
+    ("umm uh um, uhh", {'umm': 1, 'uh': 1, 'um': 1, 'uhh': 1}, ","),
+]
+
+
+def test_overlapping_phrases():
+    for text, expected, clean in OVERLAP_CASES:
+        result = VoiceAnalyzer._analyze_filler_words(text)
+        assert result['fillers_found'] == expected, (text, result['fillers_found'])
+        assert result['filler_count'] == sum(expected.values()), text
+        assert result['clean_transcript'] == clean, (text, result['clean_transcript'])
+
+
+def test_positions():
+    for text, _, _ in OVERLAP_CASES:
+        positions = VoiceAnalyzer._analyze_filler_words(text)['filler_positions']
+        # Each position covers exactly its filler, in order, without overlapping the next
+        for position in positions:
+            assert ' '.join(text[position['start']:position['end']].lower().split()) == position['word'], (text, position)
+        assert all(a['end'] <= b['start'] for a, b in zip(positions, positions[1:])), text
+
+    positions = VoiceAnalyzer._analyze_filler_words("I kind of like it")['filler_positions']
+    assert positions == [
+        {'word': 'kind of', 'start': 2, 'end': 9},
+        {'word': 'like', 'start': 10, 'end': 14}
+    ]
+
+
+if __name__ == "__main__":
+    test_overlapping_phrases()
+    test_positions()
+    print('OK: overlapping filler phrases')
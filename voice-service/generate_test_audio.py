@@ -1,6 +1,9 @@
 """
 Generate a test audio file for testing the voice analyzer
 Creates a simple audio tone (beep) that can be analyzed
+
+synthesize_speech_like() and write_audio() also build the deterministic
+benchmark corpus (see benchmarks/corpus.py).
 """
 
 import numpy as np
@@ -31,5 +34,62 @@ def generate_test_audio(filename="test_audio.wav", duration=5):
     print("  2. Save as test_speech.wav")
     print("  3. Run: python voice_analyzer.py test_speech.wav")
 
+def synthesize_speech_like(duration, sample_rate=16000, voiced_ratio=0.8, seed=0):
+    """
+    Deterministic speech-like signal: a harmonic 'voice' with a wandering
+    f0 (~90-220 Hz) in phrases separated by near-silence.
+
+    Args:
+        duration: Length in seconds
+        sample_rate: Output sample rate (Hz)
+        voiced_ratio: Fraction of each 2.5 s phrase cycle that is voiced
+            (0.8 = dense answer, 0.2 = silence-heavy)
+        seed: Seed for the background noise
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration * sample_rate)
+    t = np.arange(n) / sample_rate
+
+    # Slow intonation contour around 150 Hz
+    f0 = 150 + 50 * np.sin(2 * np.pi * 0.3 * t) + 20 * np.sin(2 * np.pi * 1.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    # Syllable-rate amplitude modulation (~4 Hz) inside voiced phrases
+    syllables = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2
+    gate = (t % 2.5) < 2.5 * voiced_ratio
+    noise = rng.normal(0, 0.01, n)
+    return (0.3 * voice * syllables * gate + noise).astype(np.float32)
+
+def write_audio(path, audio, sample_rate):
+    """Write mono float audio as WAV (soundfile) or WebM/Opus (PyAV)"""
+    if not str(path).endswith('.webm'):
+        sf.write(path, audio, sample_rate)
+        return
+
+    import av
+
+    # Opus only supports 8/12/16/24/48 kHz, browsers record at 48 kHz
+    if sample_rate not in (8000, 12000, 16000, 24000, 48000):
+        raise ValueError(f"WebM/Opus does not support {sample_rate} Hz")
+    samples = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    with av.open(str(path), 'w', format='webm') as container:
+        stream = container.add_stream('libopus', rate=sample_rate)
+        stream.layout = 'mono'
+        frame_size = stream.codec_context.frame_size or 960
+        pts = 0
+        for start in range(0, len(samples), frame_size):
+            chunk = samples[start:start + frame_size]
+            if len(chunk) < frame_size:
+                chunk = np.pad(chunk, (0, frame_size - len(chunk)))
+            frame = av.AudioFrame.from_ndarray(chunk.reshape(1, -1), format='s16', layout='mono')
+            frame.sample_rate = sample_rate
+            frame.pts = pts
+            pts += frame_size
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
 if __name__ == "__main__":
     generate_test_audio()
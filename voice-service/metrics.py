@@ -0,0 +1,119 @@
+"""
+Prometheus-style metrics for the voice service
+Fixed-bucket histograms (one bisect + two adds per observation) so they
+stay on in production. Rendered in the Prometheus text exposition format.
+"""
+
+import bisect
+import threading
+
+# Seconds per stage: decode/fillers are ms, transcription can take tens of seconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Processing seconds per audio second (< 1 is faster than real time)
+RTF_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+class Histogram:
+    """Cumulative-on-render histogram with fixed upper bounds"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels=''):
+        lines = []
+        cumulative = 0
+        sep = ',' if labels else ''
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.sum:.6f}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+
+class VoiceMetrics:
+    """Stage latencies, audio throughput and errors by stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = {}
+        self.realtime_factor = Histogram(RTF_BUCKETS)
+        self.audio_seconds_total = 0.0
+        self.analyses_total = {}
+        self.errors_total = {}
+
+    def record_result(self, result):
+        """Fold one VoiceAnalyzer.analyze() result into the metrics"""
+        timings = result.get('timings') or {}
+        audio_seconds = result.get('audio_seconds') or 0.0
+        outcome = 'success' if result.get('success') else 'failure'
+
+        with self._lock:
+            self.analyses_total[outcome] = self.analyses_total.get(outcome, 0) + 1
+            for stage, seconds in timings.items():
+                if stage not in self.stage_seconds:
+                    self.stage_seconds[stage] = Histogram(STAGE_BUCKETS)
+                self.stage_seconds[stage].observe(seconds)
+            if audio_seconds > 0:
+                self.audio_seconds_total += audio_seconds
+                if 'total' in timings:
+                    self.realtime_factor.observe(timings['total'] / audio_seconds)
+            if result.get('error_stage'):
+                self._count_error(result['error_stage'])
+
+    def record_error(self, stage):
+        """Count an error outside analyze() itself (e.g. 'upload', 'queue')"""
+        with self._lock:
+            self._count_error(stage)
+
+    def _count_error(self, stage):
+        """Caller holds the lock"""
+        self.errors_total[stage] = self.errors_total.get(stage, 0) + 1
+
+    def render(self, gauges=None, counters=None):
+        """
+        Text exposition; `gauges` adds point-in-time values and `counters`
+        monotonic totals kept elsewhere (name -> number)
+        """
+        lines = []
+        with self._lock:
+            lines.append('# HELP voice_stage_seconds Wall time per analysis stage')
+            lines.append('# TYPE voice_stage_seconds histogram')
+            for stage in sorted(self.stage_seconds):
+                lines.extend(self.stage_seconds[stage].render('voice_stage_seconds', f'stage="{stage}"'))
+
+            lines.append('# HELP voice_realtime_factor Processing seconds per second of audio')
+            lines.append('# TYPE voice_realtime_factor histogram')
+            lines.extend(self.realtime_factor.render('voice_realtime_factor'))
+
+            lines.append('# HELP voice_audio_seconds_total Seconds of audio analyzed')
+            lines.append('# TYPE voice_audio_seconds_total counter')
+            lines.append(f'voice_audio_seconds_total {self.audio_seconds_total:.3f}')
+
+            lines.append('# HELP voice_analyses_total Completed analyses by outcome')
+            lines.append('# TYPE voice_analyses_total counter')
+            for outcome, count in sorted(self.analyses_total.items()):
+                lines.append(f'voice_analyses_total{{outcome="{outcome}"}} {count}')
+
+            lines.append('# HELP voice_errors_total Errors by stage')
+            lines.append('# TYPE voice_errors_total counter')
+            for stage, count in sorted(self.errors_total.items()):
+                lines.append(f'voice_errors_total{{stage="{stage}"}} {count}')
+
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        for name, value in sorted((counters or {}).items()):
+            lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
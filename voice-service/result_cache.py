@@ -0,0 +1,130 @@
+"""
+Content-addressed cache for voice analysis results
+Keys are a hash of the audio bytes plus the analyzer config, so a retried
+upload of the same recording skips transcription and feature extraction.
+- In-memory LRU bounded by entry count
+- Optional on-disk tier (one JSON file per key) that survives restarts
+
+scraper/extraction_cache.py follows the same design for resume extraction;
+the services deploy separately and share no modules, so fix bugs in both.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+
+def audio_digest(audio_source, chunk_size=1 << 20):
+    """SHA-256 of raw audio bytes, or of an audio file read in chunks"""
+    if isinstance(audio_source, (bytes, bytearray)):
+        return hashlib.sha256(audio_source).hexdigest()
+    digest = hashlib.sha256()
+    with open(audio_source, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(audio_sha256, config):
+    """Combine the audio hash with a stable hash of the analyzer config"""
+    config_json = json.dumps(config, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f"{audio_sha256}:{config_json}".encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU of analysis results with an optional disk tier"""
+
+    def __init__(self, max_entries=256, disk_dir=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return a copy of the cached result, or None"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key, result):
+        """Store a successful result; failures are never cached"""
+        if not result.get('success'):
+            return
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._remember(key, result)
+        self._write_disk(key, result)
+
+    def stats(self):
+        """Counters for /health"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'disk_enabled': bool(self.disk_dir)
+            }
+
+    def _remember(self, key, result):
+        """Insert into the LRU (caller holds the lock)"""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[CACHE] Ignoring unreadable entry {path}: {e}", file=sys.stderr)
+            return None
+
+    def _write_disk(self, key, result):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            # Atomic rename so readers never see a half-written file
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[CACHE] Failed to persist {key}: {e}", file=sys.stderr)
@@ -0,0 +1,98 @@
+"""
+Output encoding for synthesized speech
+TTS engines write uncompressed PCM WAV; this re-encodes it (inside the TTS
+worker) to Opus/OGG or MP3, optionally downsampled to mono speech rates,
+and reads the true duration back from the audio.
+"""
+
+import io
+import wave
+
+# format -> (MIME type, container, encoder; None keeps PCM)
+FORMATS = {
+    'wav': ('audio/wav', 'wav', None),
+    'opus': ('audio/ogg', 'ogg', 'libopus'),
+    'mp3': ('audio/mpeg', 'mp3', 'libmp3lame'),
+}
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def mime_type(fmt):
+    return FORMATS[fmt][0]
+
+
+def audio_duration(data, fmt='wav'):
+    """Duration in seconds read from the audio itself, or None if unreadable"""
+    if fmt == 'wav':
+        try:
+            with wave.open(io.BytesIO(data), 'rb') as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError, ZeroDivisionError):
+            pass
+
+    try:
+        import av
+    except ImportError:
+        return None
+
+    try:
+        with av.open(io.BytesIO(data)) as container:
+            stream = container.streams.audio[0]
+            # Sum packet durations: demuxing only, no decode
+            ticks = sum(packet.duration or 0 for packet in container.demux(stream))
+            return float(ticks * stream.time_base) if ticks else None
+    except (av.FFmpegError, IndexError):
+        return None
+
+
+def encode_audio(wav_bytes, fmt='wav', bitrate_kbps=32, sample_rate=None):
+    """
+    Re-encode a WAV file to `fmt` as mono.
+
+    Args:
+        wav_bytes: Engine output (PCM WAV)
+        fmt: One of FORMATS
+        bitrate_kbps: Target bitrate for Opus/MP3
+        sample_rate: Output rate (e.g. 16000 for speech); None keeps the
+            engine's rate (Opus rounds up to the nearest rate it supports)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported audio format '{fmt}', expected one of {tuple(FORMATS)}")
+    if fmt == 'wav' and sample_rate is None:
+        return wav_bytes
+
+    import av
+
+    _, container_format, codec = FORMATS[fmt]
+    output = io.BytesIO()
+    with av.open(io.BytesIO(wav_bytes)) as source:
+        in_stream = source.streams.audio[0]
+        rate = sample_rate or in_stream.rate
+        if fmt == 'opus' and rate not in OPUS_RATES:
+            rate = next((r for r in OPUS_RATES if r >= rate), 48000)
+
+        with av.open(output, 'w', format=container_format) as target:
+            out_stream = target.add_stream(codec or 'pcm_s16le', rate=rate)
+            out_stream.layout = 'mono'
+            if codec:
+                out_stream.bit_rate = bitrate_kbps * 1000
+            ctx = out_stream.codec_context
+            # Opus needs exact frame sizes; the resampler re-chunks for it
+            resampler = av.AudioResampler(
+                format=ctx.format.name,
+                layout='mono',
+                rate=rate,
+                frame_size=ctx.frame_size or None
+            )
+
+            for frame in source.decode(in_stream):
+                for resampled in resampler.resample(frame):
+                    for packet in out_stream.encode(resampled):
+                        target.mux(packet)
+            for resampled in resampler.resample(None):
+                for packet in out_stream.encode(resampled):
+                    target.mux(packet)
+            for packet in out_stream.encode(None):
+                target.mux(packet)
+
+    return output.getvalue()
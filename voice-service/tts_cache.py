@@ -0,0 +1,131 @@
+"""
+Content-addressed on-disk cache for synthesized speech
+Keyed on normalized text plus every setting that changes the audio, so
+repeated interview questions are served without touching a TTS engine.
+Evicts least-recently-used files once the total size exceeds max_bytes.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Unicode-normalize and collapse whitespace (case and punctuation affect speech)"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def make_tts_key(text, **settings):
+    """SHA-256 over the normalized text and the synthesis settings"""
+    payload = json.dumps(
+        {'text': normalize_text(text), **settings},
+        sort_keys=True, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """Thread-safe, size-bounded LRU of audio files in one directory"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # file name -> size, oldest first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild LRU order from file modification times (refreshed on every hit)"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def get(self, key, ext='wav'):
+        """Audio bytes for key, or None"""
+        name = f"{key}.{ext}"
+        path = os.path.join(self.cache_dir, name)
+        with self._lock:
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Persist recency so the LRU order survives restarts
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                self._forget(name)
+            return None
+
+    def put(self, key, data, ext='wav'):
+        name = f"{key}.{ext}"
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[TTS-CACHE] Failed to store {name}: {e}", file=sys.stderr)
+            return
+        with self._lock:
+            self._forget(name)
+            self._entries[name] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _forget(self, name):
+        """Drop an index entry (caller holds the lock)"""
+        size = self._entries.pop(name, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """Delete oldest files until under budget (caller holds the lock)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
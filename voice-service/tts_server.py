@@ -0,0 +1,556 @@
+"""
+TTS HTTP Server
+Keeps initialized pyttsx3 engines warm so a question costs one synthesis,
+not an interpreter start plus engine/voice enumeration.
+
+pyttsx3 is not thread-safe, so each engine lives in its own worker process.
+Settings (environment variables):
+- TTS_WORKERS: engine processes (default 2)
+- TTS_MAX_QUEUE: requests allowed to wait for an engine (default 16)
+- TTS_REQUEST_TIMEOUT: seconds to wait for a synthesis (default 60)
+- TTS_CACHE_DIR: audio cache folder (default: <temp>/interviewly-tts-cache)
+- TTS_CACHE_MAX_MB: cache size budget, 0 disables it (default 512)
+- TTS_STREAM_LOOKAHEAD: sentences synthesized ahead of playback (default 2)
+- TTS_FORMAT: default output format, wav | opus | mp3 (default wav)
+- TTS_BITRATE_KBPS: default Opus/MP3 bitrate (default 32)
+- TTS_SAMPLE_RATE: default output sample rate, e.g. 16000 (default: engine rate)
+- TTS_BATCH_CONCURRENCY: syntheses one batch keeps in flight (default: TTS_WORKERS)
+- TTS_BATCH_MAX_ITEMS: texts accepted per batch (default 200)
+- TTS_BATCH_MAX_JOBS: finished batches kept for status queries (default 64)
+
+Start with: python tts_service_pyttsx3.py --serve [port]
+"""
+
+import base64
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import Flask, Response, request, jsonify, stream_with_context
+from tts_audio import FORMATS, audio_duration, encode_audio, mime_type
+from tts_cache import AudioCache, make_tts_key
+from tts_service_pyttsx3 import estimate_duration
+
+WORKERS = int(os.environ.get('TTS_WORKERS', '2'))
+MAX_QUEUE = int(os.environ.get('TTS_MAX_QUEUE', '16'))
+REQUEST_TIMEOUT = float(os.environ.get('TTS_REQUEST_TIMEOUT', '60'))
+CACHE_DIR = os.environ.get('TTS_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'interviewly-tts-cache')
+CACHE_MAX_MB = float(os.environ.get('TTS_CACHE_MAX_MB', '512'))
+STREAM_LOOKAHEAD = int(os.environ.get('TTS_STREAM_LOOKAHEAD', '2'))
+DEFAULT_FORMAT = os.environ.get('TTS_FORMAT', 'wav')
+DEFAULT_BITRATE_KBPS = int(os.environ.get('TTS_BITRATE_KBPS', '32'))
+DEFAULT_SAMPLE_RATE = int(os.environ.get('TTS_SAMPLE_RATE', '0')) or None
+BATCH_CONCURRENCY = int(os.environ.get('TTS_BATCH_CONCURRENCY', '0')) or WORKERS
+BATCH_MAX_ITEMS = int(os.environ.get('TTS_BATCH_MAX_ITEMS', '200'))
+BATCH_MAX_JOBS = int(os.environ.get('TTS_BATCH_MAX_JOBS', '64'))
+
+# Sentence boundary for streaming; shorter pieces are merged into the next one
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+MIN_CHUNK_CHARS = 40
+
+# Engine defaults (see TTSServicePyttsx3.__init__); part of the cache key
+DEFAULT_RATE = 150
+DEFAULT_VOLUME = 1.0
+
+app = Flask(__name__)
+
+# Per-process engine and scratch folder, set by the pool initializer
+_engine = None
+_work_dir = None
+
+
+def _init_engine():
+    global _engine, _work_dir
+    from tts_service_pyttsx3 import TTSServicePyttsx3
+    _engine = TTSServicePyttsx3()
+    _work_dir = tempfile.mkdtemp(prefix='interviewly-tts-')
+
+
+def _synthesize(text, settings):
+    """Runs in a worker: synthesize to a scratch file, encode it and return the bytes"""
+    _engine.configure(rate=settings['rate'], volume=settings['volume'], voice_id=settings['voice_id'])
+    output_path = os.path.join(_work_dir, f"{uuid.uuid4().hex}.wav")
+    try:
+        result = _engine.text_to_speech(text, output_path)
+        if result['success']:
+            with open(output_path, 'rb') as f:
+                audio = f.read()
+            # Encoding stays in the worker so the server threads never block on it
+            result['audio'] = encode_audio(
+                audio,
+                settings['format'],
+                bitrate_kbps=settings['bitrate_kbps'],
+                sample_rate=settings['sample_rate']
+            )
+            result['file_size'] = len(result['audio'])
+        result['format'] = settings['format']
+        result['cached'] = False
+        return result
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+class EnginePool:
+    """TTS worker processes behind a bounded admission queue"""
+
+    def __init__(self, workers, max_queue):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        # Spawn, not fork: the pool starts on a request thread while others are running
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_engine
+        )
+
+    def submit(self, text, settings):
+        """Queue a synthesis; returns a Future, or None if the queue is full"""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                return None
+            self._pending += 1
+        future = self._executor.submit(_synthesize, text, settings)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self):
+        with self._lock:
+            in_flight = min(self._pending, self.workers)
+            return {
+                'workers': self.workers,
+                'in_flight': in_flight,
+                'queue_depth': self._pending - in_flight,
+                'max_queue': self.max_queue,
+                'completed': self._completed,
+                'rejected': self._rejected
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Spawned workers re-import this module; only the server process owns the cache
+audio_cache = (
+    AudioCache(CACHE_DIR, int(CACHE_MAX_MB * 1024 * 1024))
+    if CACHE_MAX_MB > 0 and multiprocessing.parent_process() is None else None
+)
+
+# Syntheses in progress by cache key, so identical concurrent requests share one
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class BusyError(Exception):
+    """All engines busy and the admission queue is full"""
+
+
+def get_pool():
+    """Created on first use so spawned workers re-importing this module stay idle"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            print(f"[TTS-SERVER] Starting {WORKERS} engine worker(s)...", file=sys.stderr)
+            _pool = EnginePool(WORKERS, MAX_QUEUE)
+        return _pool
+
+
+def make_settings(rate=None, volume=None, voice_id=None, fmt=None, bitrate_kbps=None, sample_rate=None):
+    """Synthesis settings with server defaults filled in; raises ValueError on a bad format"""
+    fmt = fmt or DEFAULT_FORMAT
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {', '.join(FORMATS)}")
+    return {
+        'rate': int(rate or DEFAULT_RATE),
+        'volume': float(volume if volume is not None else DEFAULT_VOLUME),
+        'voice_id': voice_id,
+        'format': fmt,
+        'bitrate_kbps': int(bitrate_kbps or DEFAULT_BITRATE_KBPS),
+        'sample_rate': int(sample_rate or DEFAULT_SAMPLE_RATE or 0) or None
+    }
+
+
+def submit_synthesis(text, settings=None):
+    """
+    Cached, de-duplicated synthesis without waiting for it.
+    Returns a Future of a result dict with 'audio' bytes and 'cached'
+    (already completed on a cache hit). Raises BusyError when the pool is full.
+    Results may be shared between callers: treat them as read-only.
+    """
+    settings = settings or make_settings()
+    key = make_tts_key(
+        text,
+        rate=settings['rate'],
+        volume=settings['volume'],
+        voice=settings['voice_id'] or 'default',
+        format=settings['format'],
+        bitrate_kbps=settings['bitrate_kbps'] if settings['format'] != 'wav' else None,
+        sample_rate=settings['sample_rate']
+    )
+    ext = FORMATS[settings['format']][1]
+    audio = audio_cache.get(key, ext) if audio_cache else None
+    if audio is not None:
+        duration = audio_duration(audio, settings['format'])
+        future = Future()
+        future.set_result({
+            'success': True,
+            'audio': audio,
+            'cached': True,
+            'format': settings['format'],
+            'file_size': len(audio),
+            'duration': duration if duration is not None else estimate_duration(text, settings['rate']),
+            'text_length': len(text)
+        })
+        return future
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+        future = get_pool().submit(text, settings)
+        if future is None:
+            raise BusyError()
+        _inflight[key] = future
+    # Outside the lock: on an already finished future the callback runs
+    # right here, and it takes _inflight_lock itself
+    future.add_done_callback(lambda f: _on_synthesized(key, ext, f))
+    return future
+
+
+def synthesize(text, settings=None):
+    """Blocking submit_synthesis(); may also raise FutureTimeoutError"""
+    return submit_synthesis(text, settings).result(timeout=REQUEST_TIMEOUT)
+
+
+def split_sentences(text):
+    """Sentence-sized chunks in order, merging fragments under MIN_CHUNK_CHARS"""
+    chunks = []
+    pending = ''
+    for sentence in SENTENCE_END.split(text.strip()):
+        pending = f"{pending} {sentence}" if pending else sentence
+        if len(pending) >= MIN_CHUNK_CHARS:
+            chunks.append(pending)
+            pending = ''
+    if pending:
+        chunks.append(pending)
+    return chunks
+
+
+def _on_synthesized(key, ext, future):
+    # Store before un-registering so a concurrent request finds one or the other
+    if audio_cache and not future.cancelled() and future.exception() is None:
+        result = future.result()
+        if result['success']:
+            audio_cache.put(key, result['audio'], ext)
+    with _inflight_lock:
+        _inflight.pop(key, None)
+
+
+class BatchJob:
+    """
+    Background pre-synthesis of a list of texts into the audio cache.
+    Keeps at most BATCH_CONCURRENCY items in the engine pool so live
+    /speak requests still find room in the admission queue.
+    """
+
+    def __init__(self, texts, settings):
+        self.id = uuid.uuid4().hex
+        self.settings = settings
+        self.created = time.time()
+        self.finished = None
+        self.items = [{'index': i, 'text': text, 'status': 'queued'} for i, text in enumerate(texts)]
+        self._lock = threading.Lock()
+        self._remaining = len(self.items)
+        self._slots = threading.Semaphore(BATCH_CONCURRENCY)
+
+    def start(self):
+        threading.Thread(target=self._run, name=f"tts-batch-{self.id[:8]}", daemon=True).start()
+
+    def _run(self):
+        for item in self.items:
+            if not item['text']:
+                self._finish(item, {'success': False, 'error': 'Text is required'})
+                continue
+            self._slots.acquire()
+            submitted = False
+            try:
+                while True:
+                    try:
+                        future = submit_synthesis(item['text'], self.settings)
+                        break
+                    except BusyError:
+                        # Live traffic has the queue; back off instead of failing the item
+                        time.sleep(0.5)
+                with self._lock:
+                    if item['status'] == 'queued':
+                        item['status'] = 'synthesizing'
+                future.add_done_callback(lambda f, item=item: self._on_done(item, f))
+                submitted = True
+            except Exception as e:
+                self._finish(item, {'success': False, 'error': str(e) or type(e).__name__})
+            finally:
+                # Once submitted, _on_done gives the slot back
+                if not submitted:
+                    self._slots.release()
+
+    def _on_done(self, item, future):
+        try:
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e) or type(e).__name__}
+            self._finish(item, result)
+        finally:
+            self._slots.release()
+
+    def _finish(self, item, result):
+        with self._lock:
+            if result['success']:
+                item.update(
+                    status='done',
+                    cached=result['cached'],
+                    fileSizeBytes=result['file_size'],
+                    durationSeconds=result['duration']
+                )
+            else:
+                item.update(status='failed', error=result['error'])
+            self._remaining -= 1
+            if not self._remaining:
+                self.finished = time.time()
+
+    @property
+    def done(self):
+        with self._lock:
+            return self.finished is not None
+
+    def status(self):
+        with self._lock:
+            counts = {}
+            for item in self.items:
+                counts[item['status']] = counts.get(item['status'], 0) + 1
+            return {
+                'jobId': self.id,
+                'done': self.finished is not None,
+                'format': self.settings['format'],
+                'total': len(self.items),
+                'counts': counts,
+                'elapsedSeconds': round((self.finished or time.time()) - self.created, 3),
+                'items': [dict(item) for item in self.items]
+            }
+
+
+_batch_jobs = OrderedDict()
+_batch_jobs_lock = threading.Lock()
+
+
+def start_batch(texts, settings):
+    job = BatchJob(texts, settings)
+    with _batch_jobs_lock:
+        _batch_jobs[job.id] = job
+        # Forget the oldest finished jobs; running ones are never dropped
+        for job_id in [j.id for j in _batch_jobs.values() if j.done]:
+            if len(_batch_jobs) <= BATCH_MAX_JOBS:
+                break
+            del _batch_jobs[job_id]
+    job.start()
+    return job
+
+
+def running_batches():
+    with _batch_jobs_lock:
+        return sum(1 for job in _batch_jobs.values() if not job.done)
+
+
+def busy_response():
+    response = jsonify({'success': False, 'error': 'TTS is busy, retry later'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+def settings_from_body(data):
+    """make_settings() from the optional synthesis fields of a request body"""
+    return make_settings(
+        rate=data.get('rate'),
+        volume=data.get('volume'),
+        voice_id=data.get('voice'),
+        fmt=data.get('format'),
+        bitrate_kbps=data.get('bitrate'),
+        sample_rate=data.get('sample_rate')
+    )
+
+
+def parse_speak_request():
+    """(text, settings, error response) from a /speak-style JSON body"""
+    data = request.get_json(silent=True) or {}
+    text = (data.get('text') or '').strip()
+    if not text:
+        return None, None, (jsonify({'success': False, 'error': 'Text is required'}), 400)
+    try:
+        settings = settings_from_body(data)
+    except (TypeError, ValueError) as e:
+        return None, None, (jsonify({'success': False, 'error': str(e)}), 400)
+    return text, settings, None
+
+
+@app.route('/speak', methods=['POST'])
+def speak():
+    """
+    Synthesize {"text": ..., "rate"?: int, "volume"?: float, "voice"?: str,
+    "format"?: "wav" | "opus" | "mp3", "bitrate"?: kbps, "sample_rate"?: Hz}
+    Returns the same shape as the backend's TTSResponse, plus the format.
+    """
+    text, settings, error = parse_speak_request()
+    if error:
+        return error
+
+    try:
+        result = synthesize(text, settings)
+    except BusyError:
+        return busy_response()
+    except FutureTimeoutError:
+        return jsonify({'success': False, 'error': 'Text-to-speech generation timed out'}), 504
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    if not result['success']:
+        return jsonify({'success': False, 'error': result['error']}), 500
+
+    return jsonify({
+        'success': True,
+        'audioBase64': base64.b64encode(result['audio']).decode('ascii'),
+        'format': result['format'],
+        'mimeType': mime_type(result['format']),
+        'fileSizeBytes': result['file_size'],
+        'durationSeconds': result['duration'],
+        'textLength': result['text_length'],
+        'cached': result['cached']
+    })
+
+
+@app.route('/speak/stream', methods=['POST'])
+def speak_stream():
+    """
+    Sentence-chunked streaming synthesis, same body as /speak.
+    Responds with chunked NDJSON: one line per sentence as soon as it is ready
+    ({"index", "count", "text", "audioBase64", "mimeType", "durationSeconds", "cached"}),
+    then {"done": true}. Up to TTS_STREAM_LOOKAHEAD sentences are synthesized
+    ahead of the one being sent. Every chunk is a complete file in the
+    requested format.
+    """
+    text, settings, error = parse_speak_request()
+    if error:
+        return error
+
+    chunks = split_sentences(text)
+
+    def generate():
+        pending = deque()
+        next_index = 0
+        while next_index < len(chunks) or pending:
+            # Keep the look-ahead window full; a busy pool just narrows it
+            while next_index < len(chunks) and len(pending) <= STREAM_LOOKAHEAD:
+                try:
+                    pending.append(submit_synthesis(chunks[next_index], settings))
+                except BusyError:
+                    break
+                next_index += 1
+
+            if not pending:
+                yield json.dumps({'success': False, 'error': 'TTS is busy, retry later'}) + '\n'
+                return
+
+            index = next_index - len(pending)
+            try:
+                result = pending.popleft().result(timeout=REQUEST_TIMEOUT)
+            except Exception as e:
+                result = {'success': False, 'error': str(e) or 'Text-to-speech generation timed out'}
+
+            if not result['success']:
+                yield json.dumps({'index': index, 'success': False, 'error': result['error']}) + '\n'
+                return
+
+            yield json.dumps({
+                'index': index,
+                'count': len(chunks),
+                'text': chunks[index],
+                'success': True,
+                'audioBase64': base64.b64encode(result['audio']).decode('ascii'),
+                'mimeType': mime_type(settings['format']),
+                'durationSeconds': result['duration'],
+                'cached': result['cached']
+            }) + '\n'
+
+        yield json.dumps({'done': True, 'count': len(chunks)}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/speak/batch', methods=['POST'])
+def speak_batch():
+    """
+    Pre-synthesize {"texts": [...]} (plus the /speak settings) into the cache
+    in the background, e.g. a whole interview's questions at session start.
+    Returns 202 with a job id; poll GET /speak/batch/<job id> for per-item
+    status. Later /speak calls with the same text and settings are cache hits.
+    """
+    data = request.get_json(silent=True) or {}
+    texts = data.get('texts')
+    if not isinstance(texts, list) or not texts:
+        return jsonify({'success': False, 'error': 'texts must be a non-empty list'}), 400
+    if len(texts) > BATCH_MAX_ITEMS:
+        return jsonify({'success': False, 'error': f'At most {BATCH_MAX_ITEMS} texts per batch'}), 413
+    try:
+        settings = settings_from_body(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    job = start_batch([str(text or '').strip() for text in texts], settings)
+    return jsonify({'success': True, **job.status()}), 202
+
+
+@app.route('/speak/batch/<job_id>', methods=['GET'])
+def speak_batch_status(job_id):
+    with _batch_jobs_lock:
+        job = _batch_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown batch job'}), 404
+    return jsonify({'success': True, **job.status()})
+
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    return jsonify({
+        'status': 'healthy',
+        'pool': get_pool().stats(),
+        'running_batches': running_batches(),
+        'cache': audio_cache.stats() if audio_cache else None
+    })
+
+
+def serve(host='127.0.0.1', port=5002):
+    from waitress import serve as waitress_serve
+
+    # Spin every engine up before the first question arrives
+    pool = get_pool()
+    for _ in range(pool.workers):
+        pool.submit("Ready.", make_settings())
+    print(f"[TTS-SERVER] Listening on http://{host}:{port}", file=sys.stderr)
+    waitress_serve(app, host=host, port=port, threads=WORKERS + MAX_QUEUE + 2)
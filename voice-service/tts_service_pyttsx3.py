@@ -5,7 +5,10 @@ Uses Windows SAPI5 for high-quality, accurate speech synthesis
 
 import pyttsx3
 import os
+import struct
 import sys
+import time
+import wave
 
 class TTSServicePyttsx3:
     def __init__(self, rate: int = 150, volume: float = 1.0):
@@ -27,6 +30,9 @@ class TTSServicePyttsx3:
             
             # Configure volume
             self.engine.setProperty('volume', volume)
+            self.rate = rate
+            self.volume = volume
+            self.voice_id = None
             
             # Get available voices
             voices = self.engine.getProperty('voices')
@@ -35,14 +41,35 @@ class TTSServicePyttsx3:
             for voice in voices:
                 if 'zira' in voice.name.lower() or 'hazel' in voice.name.lower():
                     self.engine.setProperty('voice', voice.id)
+                    self.voice_id = voice.id
                     print(f"[TTS-PYTTSX3] Using voice: {voice.name}")
                     break
+            else:
+                self.voice_id = self.engine.getProperty('voice')
+            # What configure() returns to when no voice is requested
+            self.default_voice_id = self.voice_id
             
             print(f"[TTS-PYTTSX3] OK Engine initialized (rate={rate} wpm, volume={volume})")
         except Exception as e:
             print(f"[TTS-PYTTSX3] ERROR Failed to initialize: {e}")
             raise
     
+    def configure(self, rate: int = None, volume: float = None, voice_id: str = None):
+        """
+        Change rate/volume/voice for subsequent calls (no-op when unchanged)
+        voice_id None selects the default voice again, not the last one used.
+        """
+        if rate is not None and rate != self.rate:
+            self.engine.setProperty('rate', rate)
+            self.rate = rate
+        if volume is not None and volume != self.volume:
+            self.engine.setProperty('volume', volume)
+            self.volume = volume
+        voice_id = voice_id or self.default_voice_id
+        if voice_id is not None and voice_id != self.voice_id:
+            self.engine.setProperty('voice', voice_id)
+            self.voice_id = voice_id
+    
     def text_to_speech(self, text: str, output_path: str = "output_speech.wav") -> dict:
         """
         Convert text to speech and save as WAV file
@@ -75,29 +102,30 @@ class TTSServicePyttsx3:
                 # Sometimes runAndWait() can fail, retry once
                 print(f"[TTS-PYTTSX3] Warning: First attempt failed ({e}), retrying...")
                 self.engine = pyttsx3.init()  # Reinitialize
-                self.engine.setProperty('rate', 150)
-                self.engine.setProperty('volume', 1.0)
+                self.engine.setProperty('rate', self.rate)
+                self.engine.setProperty('volume', self.volume)
+                if self.voice_id:
+                    self.engine.setProperty('voice', self.voice_id)
                 self.engine.save_to_file(text, output_path)
                 self.engine.runAndWait()
             
-            # Give the system a moment to finish writing the file
-            import time
-            time.sleep(0.5)
-            
-            # Verify file was created
-            if not os.path.exists(output_path):
+            # Verify file was created (and fully flushed by the engine)
+            if not wait_for_complete_file(output_path):
+                # Missing, or still short of its header's size: never hand out truncated audio
                 return {
                     "success": False,
-                    "error": "Failed to generate audio file",
+                    "error": "Failed to generate audio file" if not os.path.exists(output_path)
+                             else "Audio file was not completed in time",
                     "file_path": None
                 }
             
             file_size = os.path.getsize(output_path)
             
-            # Estimate duration (rough calculation)
             words = len(text.split())
-            rate = self.engine.getProperty('rate')
-            duration = (words / rate) * 60  # Convert to seconds
+            # Read the real length from the WAV header; estimate if unreadable
+            duration = wav_duration(output_path)
+            if duration is None:
+                duration = estimate_duration(text, self.engine.getProperty('rate'))
             
             print(f"[TTS-PYTTSX3] OK Speech generated successfully ({file_size} bytes, ~{duration:.1f}s)")
             
@@ -120,8 +148,60 @@ class TTSServicePyttsx3:
                 "file_path": None
             }
 
+def estimate_duration(text: str, rate: int) -> float:
+    """Rough spoken duration in seconds from word count and rate (wpm)"""
+    return (len(text.split()) / rate) * 60
+
+def wav_duration(path: str):
+    """Duration in seconds from a WAV file's header, or None if unreadable"""
+    try:
+        with wave.open(path, 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (OSError, wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+def wait_for_complete_file(path: str, timeout: float = 5.0, poll_interval: float = 0.01) -> bool:
+    """
+    Wait until the engine has finished writing an audio file.
+    
+    A WAV file is complete once its RIFF header size matches the file size
+    (SAPI patches the header when it closes the file). Other formats count
+    as complete once their size stops changing between polls.
+    
+    Returns:
+        True once the file is complete; False if it is missing or still
+        incomplete at the timeout
+    """
+    deadline = time.monotonic() + timeout
+    last_size = -1
+    while time.monotonic() < deadline:
+        try:
+            size = os.path.getsize(path)
+            with open(path, 'rb') as f:
+                header = f.read(12)
+        except OSError:
+            # Not created yet, or still locked by the writer
+            size, header = -1, b''
+        
+        if len(header) == 12 and header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+            if struct.unpack('<I', header[4:8])[0] + 8 == size:
+                return True
+        elif size > 0 and size == last_size:
+            return True
+        
+        last_size = size
+        time.sleep(poll_interval)
+    
+    return False
+
 def main():
     """Test the TTS service or handle command-line usage"""
+    if len(sys.argv) >= 2 and sys.argv[1] == "--serve":
+        # Long-running HTTP server: python tts_service_pyttsx3.py --serve [port]
+        from tts_server import serve
+        serve(port=int(sys.argv[2]) if len(sys.argv) > 2 else 5002)
+        return
+    
     if len(sys.argv) >= 2:
         # Command line usage: python tts_service_pyttsx3.py "text" [output_file]
         text = sys.argv[1]
@@ -8,33 +8,99 @@ Uses faster-whisper for transcription + comprehensive voice analysis:
 - Voice quality metrics
 """
 
+import io
 import sys
 import json
+import time
+import wave
 import warnings
 from pathlib import Path
+from contextlib import contextmanager
 import re
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
-try:
-    from faster_whisper import WhisperModel
-    from pydub import AudioSegment
-    import librosa
-    import numpy as np
+# Heavy audio/ML stack, imported on first use so `import voice_analyzer` stays fast
+WhisperModel = decode_audio = SentimentIntensityAnalyzer = np = librosa = None
+
+
+def load_dependencies():
+    """Import faster-whisper, librosa, numpy and VADER once (raises ImportError)"""
+    global WhisperModel, decode_audio, SentimentIntensityAnalyzer, np, librosa
+    if librosa is not None:
+        return
+    from faster_whisper import WhisperModel, decode_audio
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    import os
-except ImportError as e:
-    print(json.dumps({
-        "error": f"Missing dependency: {str(e)}",
-        "success": False
-    }))
-    sys.exit(1)
+    import numpy as np
+    # Assigned last: a partial failure leaves librosa unset so the next call retries
+    import librosa
+
+
+def _compile_filler_pattern(fillers):
+    """
+    One alternation regex for every filler, longest phrase first, so
+    "kind of" wins over any single word inside it in a left-to-right scan.
+    """
+    alternatives = sorted(fillers, key=lambda f: (-len(f.split()), -len(f), f))
+    body = '|'.join(r'\s+'.join(re.escape(w) for w in f.split()) for f in alternatives)
+    return re.compile(r'\b(?:' + body + r')\b', re.IGNORECASE)
+
+
+def _wav_bytes(samples, sample_rate):
+    """Encode float samples in [-1, 1] as an in-memory 16-bit mono WAV"""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class StageTimer:
+    """Wall-clock time per analysis stage; `current` names the stage in progress"""
+    
+    def __init__(self):
+        self.timings = {}
+        self.current = None
+        self._start = time.perf_counter()
+    
+    @contextmanager
+    def stage(self, name):
+        self.current = name
+        start = time.perf_counter()
+        yield
+        self.timings[name] = round(time.perf_counter() - start, 4)
+        # Only cleared on success, so an exception leaves the failing stage in `current`
+        self.current = None
+    
+    def finish(self):
+        timings = dict(self.timings)
+        timings['total'] = round(time.perf_counter() - self._start, 4)
+        return timings
 
 
 class VoiceAnalyzer:
     """Comprehensive voice analysis for interview evaluation"""
     
+    # Whisper and the librosa features both work on 16 kHz mono PCM
+    SAMPLE_RATE = 16000
+    MODEL_SIZE = "tiny"
+    
+    # Bump when FILLER_WORDS or the scoring thresholds change (invalidates cached results)
+    FILLER_LEXICON_VERSION = 2
+    SCORING_VERSION = 2
+    
+    # Pitch trackers: "piptrack" (full spectrum) or "yin" (faster, voice band only)
+    PITCH_MODES = ('piptrack', 'yin')
+    # pitch_variation (Hz) above which the confidence score counts the voice as
+    # engaged. The trackers measure on different scales: piptrack's value is
+    # dominated by harmonic jumps (about 820 on benchmark_pitch.py's signal),
+    # YIN's follows the real f0 contour (about 44, true spread 38 Hz).
+    PITCH_VARIATION_THRESHOLDS = {'piptrack': 50, 'yin': 20}
+    
     # Class-level caches
     _model = None
     _sentiment_analyzer = None
@@ -45,15 +111,28 @@ class VoiceAnalyzer:
         'basically', 'actually', 'literally', 'right', 'okay', 'so', 'well',
         'i mean', 'you see', 'anyway', 'yeah'
     }
+    FILLER_PATTERN = _compile_filler_pattern(FILLER_WORDS)
     
-    def __init__(self):
-        """Initialize models"""
+    def __init__(self, pitch_mode='piptrack', cpu_threads=0):
+        """
+        Initialize models
+        
+        Args:
+            pitch_mode: One of PITCH_MODES
+            cpu_threads: Threads for Whisper inference (0 = CTranslate2 default)
+        """
+        if pitch_mode not in self.PITCH_MODES:
+            raise ValueError(f"Unknown pitch_mode '{pitch_mode}', expected one of {self.PITCH_MODES}")
+        self.pitch_mode = pitch_mode
+        load_dependencies()
+        
         if VoiceAnalyzer._model is None:
-            print("Loading faster-whisper tiny model...", file=sys.stderr)
+            print(f"Loading faster-whisper {self.MODEL_SIZE} model...", file=sys.stderr)
             VoiceAnalyzer._model = WhisperModel(
-                "tiny",
+                self.MODEL_SIZE,
                 device="cpu",
                 compute_type="int8",
+                cpu_threads=cpu_threads,
                 num_workers=2
             )
             print("Whisper loaded!", file=sys.stderr)
@@ -64,71 +143,96 @@ class VoiceAnalyzer:
         self.model = VoiceAnalyzer._model
         self.sentiment_analyzer = VoiceAnalyzer._sentiment_analyzer
     
-    def analyze(self, audio_path):
-        """Full voice analysis"""
+    @classmethod
+    def config_for(cls, pitch_mode='piptrack'):
+        """Settings that affect the analysis output (used for result cache keys)"""
+        return {
+            'model_size': cls.MODEL_SIZE,
+            'sample_rate': cls.SAMPLE_RATE,
+            'pitch_mode': pitch_mode,
+            'filler_lexicon_version': cls.FILLER_LEXICON_VERSION,
+            'scoring_version': cls.SCORING_VERSION
+        }
+    
+    def config(self):
+        """Output-affecting settings of this instance"""
+        return self.config_for(self.pitch_mode)
+    
+    def analyze(self, audio_source):
+        """
+        Full voice analysis
+        
+        Args:
+            audio_source: File path, raw audio bytes, or a binary file object
+        
+        The result carries per-stage wall times (seconds) under "timings";
+        failures also name the stage that raised in "error_stage".
+        """
+        timer = StageTimer()
+        audio_seconds = 0.0
         try:
-            # Convert WebM to WAV
-            audio_path_str = str(audio_path)
-            wav_path = audio_path_str
-            
-            if audio_path_str.endswith('.webm'):
-                print("Converting WebM to WAV...", file=sys.stderr)
-                audio = AudioSegment.from_file(audio_path_str, format="webm")
-                wav_path = audio_path_str.replace('.webm', '.wav')
-                audio.export(wav_path, format="wav")
+            # Decode once; every stage below shares this buffer
+            with timer.stage('decode'):
+                audio = self._load_audio(audio_source)
+            audio_seconds = len(audio) / self.SAMPLE_RATE
             
             # 1. TRANSCRIPTION
             print("Transcribing...", file=sys.stderr)
-            segments, info = self.model.transcribe(
-                wav_path,
-                beam_size=1,
-                vad_filter=True,
-                vad_parameters=dict(
-                    min_silence_duration_ms=500,
-                    speech_pad_ms=400
-                ),
-                language="en",
-                without_timestamps=False  # Need timestamps for pace analysis
-            )
+            # transcribe() runs VAD up front; decoding happens while iterating segments
+            with timer.stage('vad'):
+                segments, info = self.model.transcribe(
+                    audio,
+                    beam_size=1,
+                    vad_filter=True,
+                    vad_parameters=dict(
+                        min_silence_duration_ms=500,
+                        speech_pad_ms=400
+                    ),
+                    language="en",
+                    without_timestamps=False  # Need timestamps for pace analysis
+                )
             
             # Collect segments with timestamps
             all_segments = []
             transcript_parts = []
             
-            for segment in segments:
-                all_segments.append({
-                    'text': segment.text,
-                    'start': segment.start,
-                    'end': segment.end
-                })
-                transcript_parts.append(segment.text)
+            with timer.stage('transcription'):
+                for segment in segments:
+                    all_segments.append({
+                        'text': segment.text,
+                        'start': segment.start,
+                        'end': segment.end
+                    })
+                    transcript_parts.append(segment.text)
             
             transcript = " ".join(transcript_parts).strip()
             
             if not transcript:
                 return {
                     "success": False,
-                    "error": "No speech detected"
+                    "error": "No speech detected",
+                    "audio_seconds": round(audio_seconds, 3),
+                    "timings": timer.finish()
                 }
             
             # 2. FILLER WORDS ANALYSIS
-            filler_analysis = self._analyze_filler_words(transcript)
+            with timer.stage('fillers'):
+                filler_analysis = self._analyze_filler_words(transcript)
             clean_transcript = filler_analysis['clean_transcript']
             
             # 3. SENTIMENT ANALYSIS (Confidence indicators)
-            sentiment_scores = self.sentiment_analyzer.polarity_scores(transcript)
+            with timer.stage('sentiment'):
+                sentiment_scores = self.sentiment_analyzer.polarity_scores(transcript)
             print(f"[SENTIMENT] Transcript for analysis: '{transcript}'", file=sys.stderr)
             print(f"[SENTIMENT] Scores: pos={sentiment_scores['pos']}, neu={sentiment_scores['neu']}, neg={sentiment_scores['neg']}, compound={sentiment_scores['compound']}", file=sys.stderr)
             
             # 4. SPEECH PACE ANALYSIS
-            pace_analysis = self._analyze_speech_pace(all_segments, wav_path)
+            with timer.stage('pace'):
+                pace_analysis = self._analyze_speech_pace(all_segments)
             
             # 5. VOICE QUALITY ANALYSIS
-            voice_quality = self._analyze_voice_quality(wav_path)
-            
-            # Clean up WAV file
-            if wav_path != audio_path_str and os.path.exists(wav_path):
-                os.remove(wav_path)
+            with timer.stage('voice_quality'):
+                voice_quality = self._analyze_voice_quality(audio, self.SAMPLE_RATE)
             
             # 6. CALCULATE CONFIDENCE SCORE
             confidence_score = self._calculate_confidence_score(
@@ -151,7 +255,8 @@ class VoiceAnalyzer:
                     "filler_words": {
                         "count": filler_analysis['filler_count'],
                         "percentage": filler_analysis['filler_percentage'],
-                        "found": filler_analysis['fillers_found']
+                        "found": filler_analysis['fillers_found'],
+                        "positions": filler_analysis['filler_positions']
                     },
                     "sentiment": {
                         "positive": sentiment_scores['pos'],
@@ -168,55 +273,65 @@ class VoiceAnalyzer:
                         "energy_level": voice_quality['energy_level'],
                         "clarity_score": voice_quality['clarity_score']
                     }
-                }
+                },
+                "audio_seconds": round(audio_seconds, 3),
+                "timings": timer.finish()
             }
             
         except Exception as e:
-            print(f"Error: {str(e)}", file=sys.stderr)
+            # Raised between stages (e.g. while scoring): not attributable to one
+            error_stage = timer.current or 'other'
+            print(f"Error in stage '{error_stage}': {str(e)}", file=sys.stderr)
             return {
                 "success": False,
-                "error": str(e)
+                "error": str(e),
+                "error_stage": error_stage,
+                "audio_seconds": round(audio_seconds, 3),
+                "timings": timer.finish()
             }
     
-    def _analyze_filler_words(self, transcript):
-        """Detect and count filler words"""
-        transcript_lower = transcript.lower()
-        words = transcript_lower.split()
-        
+    def _load_audio(self, audio_source):
+        """Decode any supported container to 16 kHz mono float32 in memory"""
+        if isinstance(audio_source, (bytes, bytearray)):
+            print(f"Decoding {len(audio_source)} bytes of uploaded audio", file=sys.stderr)
+            audio_source = io.BytesIO(audio_source)
+        elif not hasattr(audio_source, 'read'):
+            print(f"Decoding audio: {audio_source}", file=sys.stderr)
+            audio_source = str(audio_source)
+        return decode_audio(audio_source, sampling_rate=self.SAMPLE_RATE)
+    
+    @classmethod
+    def _analyze_filler_words(cls, transcript):
+        """Detect, count and strip filler words in a single scan of the transcript"""
         filler_count = 0
         fillers_found = {}
+        filler_positions = []
+        kept_parts = []
+        last_end = 0
         
-        # Check for single-word fillers
-        for word in words:
-            clean_word = re.sub(r'[^\w\s]', '', word)
-            if clean_word in self.FILLER_WORDS:
-                filler_count += 1
-                fillers_found[clean_word] = fillers_found.get(clean_word, 0) + 1
+        for match in cls.FILLER_PATTERN.finditer(transcript):
+            filler = ' '.join(match.group(0).lower().split())
+            filler_count += 1
+            fillers_found[filler] = fillers_found.get(filler, 0) + 1
+            filler_positions.append({'word': filler, 'start': match.start(), 'end': match.end()})
+            kept_parts.append(transcript[last_end:match.start()])
+            last_end = match.end()
+        kept_parts.append(transcript[last_end:])
         
-        # Check for multi-word fillers
-        for filler in ['you know', 'i mean', 'sort of', 'kind of', 'you see']:
-            count = transcript_lower.count(filler)
-            if count > 0:
-                filler_count += count
-                fillers_found[filler] = count
+        clean_text = ' '.join(''.join(kept_parts).split())
         
-        # Remove fillers for clean transcript
-        clean_text = transcript
-        for filler in fillers_found.keys():
-            clean_text = re.sub(r'\b' + re.escape(filler) + r'\b', '', clean_text, flags=re.IGNORECASE)
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-        
-        total_words = len(words)
+        total_words = len(transcript.split())
         filler_percentage = (filler_count / total_words * 100) if total_words > 0 else 0
         
         return {
             'filler_count': filler_count,
             'filler_percentage': round(filler_percentage, 2),
             'fillers_found': fillers_found,
+            'filler_positions': filler_positions,
             'clean_transcript': clean_text
         }
     
-    def _analyze_speech_pace(self, segments, wav_path):
+    def _analyze_speech_pace(self, segments):
         """Analyze speaking rate"""
         if not segments:
             return {'wpm': 0, 'pace_rating': 'unknown'}
@@ -241,37 +356,11 @@ class VoiceAnalyzer:
             'pace_rating': pace_rating
         }
     
-    def _analyze_voice_quality(self, wav_path):
+    def _analyze_voice_quality(self, y, sr):
         """Analyze voice characteristics using librosa"""
         try:
-            print(f"[VOICE-QUALITY] Loading audio file: {wav_path}", file=sys.stderr)
-            y, sr = librosa.load(wav_path, sr=None)
-            print(f"[VOICE-QUALITY] Audio loaded successfully. Sample rate: {sr}", file=sys.stderr)
-            
-            # Pitch variation (confidence indicator)
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:
-                    pitch_values.append(pitch)
-            
-            pitch_variation = np.std(pitch_values) if pitch_values else 0
-            
-            # Energy level (confidence, assertiveness)
-            rms = librosa.feature.rms(y=y)[0]
-            energy_level = float(np.mean(rms))
-            
-            # Spectral clarity
-            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            clarity_score = float(np.mean(spectral_centroid))
-            
-            return {
-                'pitch_variation': round(float(pitch_variation), 2),
-                'energy_level': round(energy_level * 100, 2),
-                'clarity_score': round(clarity_score / 1000, 2)  # Normalize
-            }
+            print(f"[VOICE-QUALITY] Analyzing {len(y) / sr:.1f}s of audio at {sr} Hz", file=sys.stderr)
+            return self._voice_features(y, sr)
         except Exception as e:
             import traceback
             print(f"Voice quality analysis error: {e}", file=sys.stderr)
@@ -282,6 +371,79 @@ class VoiceAnalyzer:
                 'clarity_score': 0
             }
     
+    def _voice_features(self, y, sr):
+        """Pitch variation, energy and spectral clarity (raises on failure)"""
+        # Pitch variation (confidence indicator)
+        pitch_variation = self.estimate_pitch_variation(y, sr, self.pitch_mode)
+        
+        # Energy level (confidence, assertiveness)
+        rms = librosa.feature.rms(y=y)[0]
+        energy_level = float(np.mean(rms))
+        
+        # Spectral clarity
+        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+        clarity_score = float(np.mean(spectral_centroid))
+        
+        return {
+            'pitch_variation': round(float(pitch_variation), 2),
+            'energy_level': round(energy_level * 100, 2),
+            'clarity_score': round(clarity_score / 1000, 2)  # Normalize
+        }
+    
+    def warm_up(self):
+        """
+        Run every stage once on a built-in 1 s clip so the first real answer
+        does not pay for lazy initialization (PyAV, CTranslate2, librosa).
+        Raises if any stage fails; returns per-stage timings.
+        """
+        timer = StageTimer()
+        sr = self.SAMPLE_RATE
+        t = np.arange(sr) / sr
+        clip = 0.3 * np.sin(2 * np.pi * 150 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2)
+        
+        with timer.stage('decode'):
+            audio = self._load_audio(_wav_bytes(clip, sr))
+        with timer.stage('transcription'):
+            # No VAD here: it would drop the tone and skip the decoder
+            segments, _ = self.model.transcribe(audio, beam_size=1, language="en", vad_filter=False)
+            list(segments)
+        with timer.stage('fillers'):
+            self._analyze_filler_words("Um, I think I kind of like it.")
+        with timer.stage('sentiment'):
+            self.sentiment_analyzer.polarity_scores("I am confident about this answer.")
+        with timer.stage('voice_quality'):
+            self._voice_features(audio, sr)
+        
+        timings = timer.finish()
+        print(f"[WARM-UP] Done in {timings['total']}s", file=sys.stderr)
+        return timings
+    
+    @staticmethod
+    def estimate_pitch_variation(y, sr, mode='piptrack'):
+        """Standard deviation (Hz) of the per-frame pitch over voiced frames"""
+        load_dependencies()
+        if mode == 'yin':
+            # Speech f0 sits well below 4 kHz, so track on an 8 kHz copy
+            target_sr = 8000
+            if sr > target_sr:
+                y = librosa.resample(y, orig_sr=sr, target_sr=target_sr, res_type='soxr_qq')
+                sr = target_sr
+            frame_length, hop_length = 512, 256
+            f0 = librosa.yin(y, fmin=65, fmax=400, sr=sr,
+                             frame_length=frame_length, hop_length=hop_length)
+            # YIN reports a pitch for every frame; keep the ones with real signal
+            rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
+            voiced = librosa.amplitude_to_db(rms, ref=np.max) > -30
+            pitch_values = f0[voiced[:len(f0)]]
+        else:
+            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+            # Strongest bin per frame, picked for all frames at once
+            strongest = magnitudes.argmax(axis=0)
+            frame_pitches = pitches[strongest, np.arange(pitches.shape[1])]
+            pitch_values = frame_pitches[frame_pitches > 0]
+        
+        return float(np.std(pitch_values)) if pitch_values.size else 0.0
+    
     def _calculate_confidence_score(self, sentiment, filler_analysis, pace, voice_quality):
         """Calculate overall confidence score (0-100)"""
         score = 70  # Base score
@@ -313,7 +475,7 @@ class VoiceAnalyzer:
             score -= 5
         
         # Voice quality impact (0 to +10)
-        if voice_quality['pitch_variation'] > 50:
+        if voice_quality['pitch_variation'] > self.PITCH_VARIATION_THRESHOLDS[self.pitch_mode]:
             score += 5  # Good variation = engaged
         if voice_quality['energy_level'] > 5:
             score += 5  # Good energy = confident
@@ -322,15 +484,70 @@ class VoiceAnalyzer:
         return max(0, min(100, round(score)))
 
 
+def serve_stdio():
+    """
+    Long-running worker mode: keeps the models warm between jobs.
+    
+    Reads one JSON job per line on stdin, e.g.
+        {"id": "abc", "audio_path": "C:/tmp/answer.webm"}
+    and writes one JSON result per line on stdout, echoing the job id.
+    Diagnostics stay on stderr so stdout carries results only.
+    """
+    analyzer = VoiceAnalyzer()
+    analyzer.warm_up()
+    print("[WORKER] Ready for jobs on stdin", file=sys.stderr, flush=True)
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        job_id = None
+        try:
+            job = json.loads(line)
+            job_id = job.get("id")
+            audio_path = job.get("audio_path")
+            
+            if not audio_path or not Path(audio_path).exists():
+                result = {
+                    "success": False,
+                    "error": f"Audio file not found: {audio_path}"
+                }
+            else:
+                result = analyzer.analyze(audio_path)
+        except Exception as e:
+            result = {
+                "success": False,
+                "error": f"Invalid job: {str(e)}"
+            }
+        
+        result["id"] = job_id
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
 def main():
     """CLI entry point"""
     if len(sys.argv) < 2:
         print(json.dumps({
             "success": False,
-            "error": "Usage: python voice_analyzer.py <audio_file_path>"
+            "error": "Usage: python voice_analyzer.py <audio_file_path> | --serve-stdio"
         }))
         sys.exit(1)
     
+    try:
+        load_dependencies()
+    except ImportError as e:
+        print(json.dumps({
+            "error": f"Missing dependency: {str(e)}",
+            "success": False
+        }))
+        sys.exit(1)
+    
+    if sys.argv[1] == "--serve-stdio":
+        serve_stdio()
+        return
+    
     audio_path = sys.argv[1]
     
     if not Path(audio_path).exists():
@@ -1,49 +1,223 @@
 """
 Fast Voice Analysis API Server
 Keeps models in memory for instant processing
+
+Analysis runs in a pool of worker processes (one Whisper model each)
+behind a bounded admission queue. Settings (environment variables):
+- VOICE_WORKERS: analyzer processes (default: cores / VOICE_CPU_THREADS)
+- VOICE_CPU_THREADS: inference threads per worker (default 2)
+- VOICE_MAX_QUEUE: requests allowed to wait for a worker (default 8)
+- VOICE_REQUEST_TIMEOUT: seconds to wait for a result (default 120)
+- VOICE_MAX_UPLOAD_MB: size cap for uploaded audio (default 25)
+
+GET /metrics serves stage latencies and throughput in Prometheus text format.
+GET /live answers as soon as the process is up; GET /ready only returns 200
+once every worker has loaded its model and run the warm-up clip.
 """
 
+import multiprocessing
 import os
 import sys
-from flask import Flask, request, jsonify
+import threading
+from flask import Flask, Response, request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
 from voice_analyzer import VoiceAnalyzer
+from analyzer_pool import AnalysisTimeoutError, AnalyzerPool, PoolFullError
+from result_cache import ResultCache, audio_digest, make_cache_key
+from metrics import VoiceMetrics
+
+CPU_THREADS = int(os.environ.get('VOICE_CPU_THREADS', '2'))
+WORKERS = int(os.environ.get('VOICE_WORKERS', '0')) or max(1, (os.cpu_count() or 1) // CPU_THREADS)
+MAX_QUEUE = int(os.environ.get('VOICE_MAX_QUEUE', '8'))
+REQUEST_TIMEOUT = float(os.environ.get('VOICE_REQUEST_TIMEOUT', '120'))
+PITCH_MODE = os.environ.get('VOICE_PITCH_MODE', 'piptrack')
+if PITCH_MODE not in VoiceAnalyzer.PITCH_MODES:
+    raise ValueError(f"VOICE_PITCH_MODE must be one of {VoiceAnalyzer.PITCH_MODES}, not '{PITCH_MODE}'")
+MAX_UPLOAD_MB = float(os.environ.get('VOICE_MAX_UPLOAD_MB', '25'))
 
 app = Flask(__name__)
+# Werkzeug rejects larger bodies with 413; multipart files above ~500 KB spool to temp files
+app.config['MAX_CONTENT_LENGTH'] = int(MAX_UPLOAD_MB * 1024 * 1024)
+
+# Retries of the same recording are served from cache
+# VOICE_CACHE_DIR enables the on-disk tier that survives restarts
+result_cache = ResultCache(
+    max_entries=int(os.environ.get('VOICE_CACHE_SIZE', '256')),
+    disk_dir=os.environ.get('VOICE_CACHE_DIR') or None
+)
+analyzer_config = VoiceAnalyzer.config_for(PITCH_MODE)
+metrics = VoiceMetrics()
+
+# Created on first use so spawned worker processes that re-import this
+# module do not start pools of their own
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            print("Initializing Voice Analyzer workers...", file=sys.stderr)
+            _pool = AnalyzerPool(
+                workers=WORKERS,
+                cpu_threads=CPU_THREADS,
+                max_queue=MAX_QUEUE,
+                pitch_mode=PITCH_MODE
+            )
+        return _pool
+
+
+def start_warm_up():
+    """Create the pool and warm every worker in the background"""
+    def run():
+        try:
+            if get_pool().warm_up():
+                print("Service ready!", file=sys.stderr)
+        except Exception as e:
+            print(f"Warm-up failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=run, name='warm-up', daemon=True).start()
+
+
+def read_uploaded_audio():
+    """
+    Audio bytes sent with the request, or None for the JSON path contract
+    Accepts a multipart 'file' field or a raw audio/* / octet-stream body.
+    """
+    if 'file' in request.files:
+        return request.files['file'].read()
+    if request.mimetype.startswith('audio/') or request.mimetype == 'application/octet-stream':
+        return request.get_data(cache=False)
+    return None
+
+
+def busy_response(retry_after):
+    response = jsonify({
+        'success': False,
+        'error': 'Voice analysis is busy, retry later'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
 
-# Initialize analyzer once (models stay in memory)
-print("Initializing Voice Analyzer service...", file=sys.stderr)
-analyzer = VoiceAnalyzer()
-print("Service ready!", file=sys.stderr)
 
 @app.route('/analyze', methods=['POST'])
 def analyze_audio():
-    """Analyze audio file"""
+    """
+    Analyze uploaded audio bytes, or a file path on a shared disk
+    Add ?timings=1 to include per-stage wall times in the response.
+    """
+    include_timings = request.args.get('timings') in ('1', 'true')
     try:
-        # Get file path from request
-        data = request.get_json()
-        audio_path = data.get('audio_path')
-        
-        if not audio_path or not os.path.exists(audio_path):
+        audio_source = read_uploaded_audio()
+
+        if audio_source is None:
+            # Get file path from request
+            data = request.get_json(silent=True) or {}
+            audio_source = data.get('audio_path')
+
+            if not audio_source or not os.path.exists(audio_source):
+                return jsonify({
+                    'success': False,
+                    'error': 'Audio file not found'
+                }), 400
+        elif not audio_source:
             return jsonify({
                 'success': False,
-                'error': 'Audio file not found'
+                'error': 'Uploaded audio is empty'
             }), 400
-        
-        # Analyze (fast since models are already loaded)
-        result = analyzer.analyze(audio_path)
+
+        cache_key = make_cache_key(audio_digest(audio_source), analyzer_config)
+        result = result_cache.get(cache_key)
+        if result is not None:
+            result['cached'] = True
+            # Stage times belong to the run that filled the cache, not this request
+            result.pop('timings', None)
+        else:
+            # Analyze on a warm worker process
+            result = get_pool().analyze(audio_source, timeout=REQUEST_TIMEOUT)
+            metrics.record_result(result)
+            result_cache.put(cache_key, result)
+
+        if not include_timings:
+            result.pop('timings', None)
         return jsonify(result)
-        
+
+    except RequestEntityTooLarge:
+        metrics.record_error('upload')
+        return jsonify({
+            'success': False,
+            'error': f"Audio exceeds {MAX_UPLOAD_MB:g} MB limit"
+        }), 413
+    except PoolFullError as e:
+        metrics.record_error('queue')
+        return busy_response(e.retry_after)
+    except AnalysisTimeoutError as e:
+        metrics.record_error('timeout')
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 504
     except Exception as e:
+        metrics.record_error('service')
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/live', methods=['GET'])
+def liveness():
+    """Process is up and serving HTTP"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/ready', methods=['GET'])
+def readiness():
+    """200 only after the models and feature extractors have actually run"""
+    pool = get_pool()
+    if pool.ready:
+        return jsonify({'status': 'ready'})
+    return jsonify({
+        'status': 'error' if pool.warm_up_error else 'warming_up',
+        'error': pool.warm_up_error
+    }), 503
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Check if service is running"""
-    return jsonify({'status': 'healthy', 'models_loaded': True})
+    pool = get_pool()
+    return jsonify({
+        'status': 'healthy' if pool.ready else 'starting',
+        'models_loaded': pool.ready,
+        'cache': result_cache.stats(),
+        'pool': pool.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape target"""
+    pool_stats = get_pool().stats()
+    cache_stats = result_cache.stats()
+    gauges = {
+        'voice_pool_in_flight': pool_stats['in_flight'],
+        'voice_pool_queue_depth': pool_stats['queue_depth']
+    }
+    counters = {
+        'voice_pool_rejected_total': pool_stats['rejected'],
+        'voice_cache_hits_total': cache_stats['hits'],
+        'voice_cache_misses_total': cache_stats['misses']
+    }
+    return Response(metrics.render(gauges, counters), mimetype='text/plain; version=0.0.4')
+
+# Serve /live right away; /ready turns green once warm-up finishes. Runs on
+# import so WSGI servers (waitress-serve voice_service_api:app) warm up too,
+# but not in analyzer worker processes that re-import this module
+if multiprocessing.parent_process() is None:
+    start_warm_up()
 
 if __name__ == '__main__':
+    from waitress import serve
+
     # Run on port 5001 (backend on 5000, frontend on 5173)
-    app.run(host='127.0.0.1', port=5001, debug=False)
+    # Enough HTTP threads for every running and queued job plus health checks
+    serve(app, host='127.0.0.1', port=5001, threads=WORKERS + MAX_QUEUE + 2)